@@ -1,33 +1,56 @@
+import asyncio
 from logging.config import fileConfig
 
 from alembic import context
 from auth.models import *
 from books.models import *
 from core.db import Base
-from sqlalchemy import engine_from_config, pool
+from core.settings import ASYNC_DATABASE_URL
+from sqlalchemy import pool
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import create_async_engine
 
 config = context.config
-fileConfig(config.config_file_name)
+# core.migrations passes an open connection and keeps the app's logging.
+shared_connection = config.attributes.get("connection")
+if shared_connection is None and config.config_file_name is not None:
+    fileConfig(config.config_file_name)
 target_metadata = Base.metadata
 
 
+def database_url() -> str:
+    """Return the URL given to Alembic, or the application's Postgres URL."""
+    return config.get_main_option("sqlalchemy.url") or ASYNC_DATABASE_URL
+
+
 def run_migrations_offline():
-    url = config.get_main_option("sqlalchemy.url")
-    context.configure(url=url, target_metadata=target_metadata, literal_binds=True)
+    context.configure(
+        url=database_url(), target_metadata=target_metadata, literal_binds=True
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def do_run_migrations(connection: Connection) -> None:
+    """Run the migrations on a synchronous connection."""
+    context.configure(connection=connection, target_metadata=target_metadata)
     with context.begin_transaction():
         context.run_migrations()
 
 
+async def run_async_migrations() -> None:
+    """Connect with the async engine and run the migrations on it."""
+    connectable = create_async_engine(database_url(), poolclass=pool.NullPool)
+    async with connectable.connect() as connection:
+        await connection.run_sync(do_run_migrations)
+    await connectable.dispose()
+
+
 def run_migrations_online():
-    connectable = engine_from_config(
-        config.get_section(config.config_ini_section),
-        prefix="sqlalchemy.",
-        poolclass=pool.NullPool,
-    )
-    with connectable.connect() as connection:
-        context.configure(connection=connection, target_metadata=target_metadata)
-        with context.begin_transaction():
-            context.run_migrations()
+    if shared_connection is None:
+        asyncio.run(run_async_migrations())
+    else:
+        do_run_migrations(shared_connection)
 
 
 if context.is_offline_mode():
@@ -0,0 +1,153 @@
+"""Initial schema: users, refresh tokens, books and authors.
+
+Includes the trigram search and keyset pagination indexes. Every step is
+guarded with IF NOT EXISTS, so databases created by create_all before
+migrations existed upgrade in place.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18 07:40:00.000000
+
+"""
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "0001"
+down_revision: str | Sequence[str] | None = None
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def timestamps() -> list[sa.Column]:
+    """Columns of BaseTimeStampModel, the primary key included."""
+    return [
+        sa.Column("created_at", sa.TIMESTAMP(timezone=True), nullable=False),
+        sa.Column(
+            "updated_at",
+            sa.TIMESTAMP(timezone=True),
+            server_default=sa.func.now(),
+            nullable=False,
+        ),
+        sa.Column("id", sa.Integer(), primary_key=True),
+    ]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.create_table(
+        "users",
+        sa.Column("username", sa.String(32), nullable=False),
+        sa.Column("password", sa.String(255), nullable=False),
+        sa.Column("is_active", sa.Boolean(), nullable=False),
+        *timestamps(),
+        if_not_exists=True,
+    )
+    op.create_table(
+        "refresh_tokens",
+        sa.Column("refresh_token", postgresql.UUID(), nullable=False),
+        sa.Column("expires_in", sa.Float(), nullable=False),
+        sa.Column(
+            "user_id",
+            sa.Integer(),
+            sa.ForeignKey("users.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        *timestamps(),
+        if_not_exists=True,
+    )
+    op.create_index(
+        "ix_refresh_tokens_refresh_token",
+        "refresh_tokens",
+        ["refresh_token"],
+        if_not_exists=True,
+    )
+    op.create_table(
+        "authors",
+        sa.Column("name", sa.String(255), nullable=False),
+        *timestamps(),
+        if_not_exists=True,
+    )
+    op.create_index(
+        "ix_authors_name", "authors", ["name"], unique=True, if_not_exists=True
+    )
+    op.create_table(
+        "books",
+        sa.Column("title", sa.String(255), nullable=False),
+        sa.Column("published_year", sa.Integer(), nullable=False),
+        sa.Column(
+            "genres",
+            postgresql.ARRAY(sa.String(50)),
+            server_default="{}",
+            nullable=False,
+        ),
+        *timestamps(),
+        if_not_exists=True,
+    )
+    op.create_table(
+        "book_authors",
+        sa.Column(
+            "book_id",
+            sa.Integer(),
+            sa.ForeignKey("books.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        sa.Column(
+            "author_id",
+            sa.Integer(),
+            sa.ForeignKey("authors.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        sa.UniqueConstraint("book_id", "author_id", name="uq_book_author"),
+        if_not_exists=True,
+    )
+
+    # Fuzzy search.
+    op.create_index(
+        "ix_books_title_trgm",
+        "books",
+        ["title"],
+        postgresql_using="gin",
+        postgresql_ops={"title": "gin_trgm_ops"},
+        if_not_exists=True,
+    )
+    op.create_index(
+        "ix_authors_name_trgm",
+        "authors",
+        ["name"],
+        postgresql_using="gin",
+        postgresql_ops={"name": "gin_trgm_ops"},
+        if_not_exists=True,
+    )
+    # Keyset pagination, one index per sort key; they supersede the plain
+    # title and published_year indexes of the first create_all schema.
+    op.create_index(
+        "ix_books_created_at_id",
+        "books",
+        [sa.text("created_at DESC"), sa.text("id DESC")],
+        if_not_exists=True,
+    )
+    op.create_index(
+        "ix_books_published_year_id",
+        "books",
+        ["published_year", "id"],
+        if_not_exists=True,
+    )
+    op.create_index(
+        "ix_books_title_id", "books", ["title", "id"], if_not_exists=True
+    )
+    op.drop_index("ix_books_title", "books", if_exists=True)
+    op.drop_index("ix_books_published_year", "books", if_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("book_authors")
+    op.drop_table("books")
+    op.drop_table("authors")
+    op.drop_table("refresh_tokens")
+    op.drop_table("users")
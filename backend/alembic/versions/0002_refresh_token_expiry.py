@@ -0,0 +1,105 @@
+"""Refresh tokens: absolute expires_at, one token per user.
+
+expires_in held seconds counted from created_at; it becomes the indexed
+timestamp expires_at. Duplicate tokens per user, and duplicate token
+values, are deleted (the latest expiry wins) before refresh_token and
+user_id become unique.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 07:41:00.000000
+
+"""
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0002"
+down_revision: str | Sequence[str] | None = "0001"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    inspector = sa.inspect(op.get_bind())
+    columns = {c["name"] for c in inspector.get_columns("refresh_tokens")}
+    if "expires_in" in columns:
+        op.alter_column(
+            "refresh_tokens",
+            "expires_in",
+            new_column_name="expires_at",
+            type_=sa.TIMESTAMP(timezone=True),
+            postgresql_using="created_at + expires_in * interval '1 second'",
+        )
+    op.create_index(
+        "ix_refresh_tokens_expires_at",
+        "refresh_tokens",
+        ["expires_at"],
+        if_not_exists=True,
+    )
+
+    op.execute(
+        """
+        DELETE FROM refresh_tokens AS stale
+        USING refresh_tokens AS kept
+        WHERE stale.user_id = kept.user_id
+          AND (stale.expires_at, stale.id) < (kept.expires_at, kept.id)
+        """
+    )
+    op.execute(
+        """
+        DELETE FROM refresh_tokens AS stale
+        USING refresh_tokens AS kept
+        WHERE stale.refresh_token = kept.refresh_token
+          AND (stale.expires_at, stale.id) < (kept.expires_at, kept.id)
+        """
+    )
+
+    token_index = next(
+        (
+            index
+            for index in inspector.get_indexes("refresh_tokens")
+            if index["name"] == "ix_refresh_tokens_refresh_token"
+        ),
+        None,
+    )
+    if token_index is None or not token_index["unique"]:
+        op.drop_index(
+            "ix_refresh_tokens_refresh_token", "refresh_tokens", if_exists=True
+        )
+        op.create_index(
+            "ix_refresh_tokens_refresh_token",
+            "refresh_tokens",
+            ["refresh_token"],
+            unique=True,
+        )
+    unique_columns = [
+        constraint["column_names"]
+        for constraint in inspector.get_unique_constraints("refresh_tokens")
+    ]
+    if ["user_id"] not in unique_columns:
+        op.create_unique_constraint(
+            "refresh_tokens_user_id_key", "refresh_tokens", ["user_id"]
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint(
+        "refresh_tokens_user_id_key", "refresh_tokens", type_="unique"
+    )
+    op.drop_index("ix_refresh_tokens_refresh_token", "refresh_tokens")
+    op.create_index(
+        "ix_refresh_tokens_refresh_token", "refresh_tokens", ["refresh_token"]
+    )
+    op.drop_index("ix_refresh_tokens_expires_at", "refresh_tokens")
+    op.alter_column(
+        "refresh_tokens",
+        "expires_at",
+        new_column_name="expires_in",
+        type_=sa.Float(),
+        postgresql_using="extract(epoch FROM expires_at - created_at)",
+    )
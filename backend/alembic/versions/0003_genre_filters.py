@@ -0,0 +1,64 @@
+"""Genre filters: GIN index on genres and the genre_mask bitmask.
+
+genre_mask holds one bit per allowed genre, in the order of
+core.settings.ALLOWED_GENRES when this revision was written; existing
+books are backfilled from their genres array.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18 07:42:00.000000
+
+"""
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0003"
+down_revision: str | Sequence[str] | None = "0002"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        "ix_books_genres_gin",
+        "books",
+        ["genres"],
+        postgresql_using="gin",
+        if_not_exists=True,
+    )
+    op.add_column(
+        "books",
+        sa.Column(
+            "genre_mask", sa.Integer(), server_default="0", nullable=False
+        ),
+        if_not_exists=True,
+    )
+    # Books with genres but no bit set have not been backfilled yet.
+    op.execute(
+        """
+        UPDATE books
+        SET genre_mask = coalesce((
+            SELECT bit_or(bits.bit)
+            FROM unnest(books.genres) AS genre
+            JOIN (VALUES
+                ('Fiction', 1),
+                ('Non-Fiction', 2),
+                ('Science', 4),
+                ('Fantasy', 8),
+                ('History', 16),
+                ('Biography', 32)
+            ) AS bits (name, bit) ON bits.name = genre
+        ), 0)
+        WHERE genre_mask = 0 AND genres <> '{}'
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("books", "genre_mask")
+    op.drop_index("ix_books_genres_gin", "books")
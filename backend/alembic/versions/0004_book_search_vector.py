@@ -0,0 +1,148 @@
+"""Full-text search: books.search_vector, its triggers and GIN index.
+
+Title (weight A), author names (B) and genres (C) of a book are recomputed
+when the book row is written and, per statement, for every book whose
+author links or author names changed. The text search configuration is
+SEARCH_TEXT_CONFIG at the time of the upgrade; existing books are
+backfilled.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18 07:43:00.000000
+
+"""
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+from core.settings import SEARCH_TEXT_CONFIG
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "0004"
+down_revision: str | Sequence[str] | None = "0003"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+# Substituted by sa.DDL: %(config)s is the quoted configuration name.
+SEARCH_VECTOR_DDL = (
+    """
+    CREATE OR REPLACE FUNCTION book_search_vector(integer, text, varchar[])
+    RETURNS tsvector LANGUAGE sql STABLE AS $$
+        SELECT setweight(to_tsvector(%(config)s, coalesce($2, '')), 'A')
+            || setweight(to_tsvector(%(config)s, coalesce(
+                (SELECT string_agg(authors.name, ' ')
+                 FROM book_authors
+                 JOIN authors ON authors.id = book_authors.author_id
+                 WHERE book_authors.book_id = $1), '')), 'B')
+            || setweight(to_tsvector(
+                %(config)s, array_to_string($3, ' ')), 'C')
+    $$
+    """,
+    """
+    CREATE OR REPLACE FUNCTION books_search_vector_row() RETURNS trigger
+    LANGUAGE plpgsql AS $$
+    BEGIN
+        NEW.search_vector := book_search_vector(NEW.id, NEW.title, NEW.genres);
+        RETURN NEW;
+    END
+    $$
+    """,
+    """
+    CREATE OR REPLACE TRIGGER books_search_vector
+    BEFORE INSERT OR UPDATE OF title, genres ON books
+    FOR EACH ROW EXECUTE FUNCTION books_search_vector_row()
+    """,
+    """
+    CREATE OR REPLACE FUNCTION book_authors_search_vector() RETURNS trigger
+    LANGUAGE plpgsql AS $$
+    BEGIN
+        UPDATE books
+        SET search_vector =
+            book_search_vector(books.id, books.title, books.genres)
+        WHERE books.id IN (SELECT book_id FROM changed_links);
+        RETURN NULL;
+    END
+    $$
+    """,
+    """
+    CREATE OR REPLACE TRIGGER book_authors_search_vector_insert
+    AFTER INSERT ON book_authors REFERENCING NEW TABLE AS changed_links
+    FOR EACH STATEMENT EXECUTE FUNCTION book_authors_search_vector()
+    """,
+    """
+    CREATE OR REPLACE TRIGGER book_authors_search_vector_delete
+    AFTER DELETE ON book_authors REFERENCING OLD TABLE AS changed_links
+    FOR EACH STATEMENT EXECUTE FUNCTION book_authors_search_vector()
+    """,
+    """
+    CREATE OR REPLACE FUNCTION authors_search_vector() RETURNS trigger
+    LANGUAGE plpgsql AS $$
+    BEGIN
+        UPDATE books
+        SET search_vector =
+            book_search_vector(books.id, books.title, books.genres)
+        WHERE books.id IN (
+            SELECT book_authors.book_id
+            FROM renamed_authors
+            JOIN previous_authors ON previous_authors.id = renamed_authors.id
+            JOIN book_authors ON book_authors.author_id = renamed_authors.id
+            WHERE renamed_authors.name IS DISTINCT FROM previous_authors.name
+        );
+        RETURN NULL;
+    END
+    $$
+    """,
+    """
+    CREATE OR REPLACE TRIGGER authors_search_vector
+    AFTER UPDATE ON authors
+    REFERENCING OLD TABLE AS previous_authors NEW TABLE AS renamed_authors
+    FOR EACH STATEMENT EXECUTE FUNCTION authors_search_vector()
+    """,
+)
+
+
+def regconfig_literal(name: str) -> str:
+    """Quote a text search configuration name as a regconfig constant."""
+    return "'{}'::regconfig".format(name.replace("'", "''"))
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "books",
+        sa.Column("search_vector", postgresql.TSVECTOR(), nullable=True),
+        if_not_exists=True,
+    )
+    context = {"config": regconfig_literal(SEARCH_TEXT_CONFIG)}
+    for statement in SEARCH_VECTOR_DDL:
+        op.execute(sa.DDL(statement, context=context))
+    op.execute(
+        "UPDATE books SET search_vector = book_search_vector(id, title, genres)"
+    )
+    op.create_index(
+        "ix_books_search_vector",
+        "books",
+        ["search_vector"],
+        postgresql_using="gin",
+        if_not_exists=True,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for trigger, table in (
+        ("authors_search_vector", "authors"),
+        ("book_authors_search_vector_delete", "book_authors"),
+        ("book_authors_search_vector_insert", "book_authors"),
+        ("books_search_vector", "books"),
+    ):
+        op.execute(sa.DDL(f"DROP TRIGGER IF EXISTS {trigger} ON {table}"))
+    op.execute("DROP FUNCTION IF EXISTS authors_search_vector()")
+    op.execute("DROP FUNCTION IF EXISTS book_authors_search_vector()")
+    op.execute("DROP FUNCTION IF EXISTS books_search_vector_row()")
+    op.execute(
+        "DROP FUNCTION IF EXISTS book_search_vector(integer, text, varchar[])"
+    )
+    op.drop_index("ix_books_search_vector", "books")
+    op.drop_column("books", "search_vector")
@@ -0,0 +1,34 @@
+"""Index book_authors.author_id.
+
+The (book_id, author_id) primary key cannot serve lookups of the books of
+one author, nor the cascade when an author is deleted.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18 07:44:00.000000
+
+"""
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0005"
+down_revision: str | Sequence[str] | None = "0004"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        "ix_book_authors_author_id",
+        "book_authors",
+        ["author_id"],
+        if_not_exists=True,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_book_authors_author_id", "book_authors")
@@ -0,0 +1,70 @@
+"""In-process cache of verified token claims and users."""
+
+import hashlib
+import time
+
+from core.cache import TTLCache
+from core.metrics import register_cache
+from core.settings import AUTH_CACHE_MAXSIZE, AUTH_USER_CACHE_TTL_SECONDS
+
+from auth.models import UserModel
+
+
+class AuthCache:
+    """Verified access token claims and user snapshots shared by requests.
+
+    Claims are keyed by the token hash and never outlive the token ``exp``.
+    Users are kept as detached copies without the password hash, so they
+    can be handed to any request without touching its session.
+    """
+
+    def __init__(self, maxsize: int, user_ttl: float) -> None:
+        """Hold up to ``maxsize`` claims and users; users for ``user_ttl``."""
+        self.claims: TTLCache[bytes, dict[str, str | int]] = TTLCache(maxsize)
+        self.users: TTLCache[int, UserModel] = TTLCache(maxsize, ttl=user_ttl)
+        register_cache("auth_claims", self.claims)
+        register_cache("auth_users", self.users)
+
+    @staticmethod
+    def token_key(token: str) -> bytes:
+        """Return the cache key of a raw access token."""
+        return hashlib.sha256(token.encode()).digest()
+
+    def get_claims(self, token: str) -> dict[str, str | int] | None:
+        """Return cached verified claims of a token."""
+        return self.claims.get(self.token_key(token))
+
+    def set_claims(self, token: str, claims: dict[str, str | int]) -> None:
+        """Cache verified claims until the token expires."""
+        ttl = int(claims.get("exp", 0)) - time.time()
+        self.claims.set(self.token_key(token), claims, ttl=ttl)
+
+    def get_user(self, user_id: int) -> UserModel | None:
+        """Return the cached snapshot of a user."""
+        return self.users.get(user_id)
+
+    def set_user(self, user: UserModel) -> UserModel:
+        """Cache and return a detached snapshot of ``user``."""
+        snapshot = UserModel(
+            id=user.id,
+            username=user.username,
+            is_active=user.is_active,
+            created_at=user.created_at,
+            updated_at=user.updated_at,
+        )
+        self.users.set(user.id, snapshot)
+        return snapshot
+
+    def invalidate_user(self, user_id: int) -> None:
+        """Forget the user snapshot and every cached token of the user."""
+        self.users.pop(user_id)
+        subject = str(user_id)
+        self.claims.discard_where(
+            lambda _, claims: claims.get("sub") == subject
+        )
+
+
+auth_cache = AuthCache(
+    maxsize=AUTH_CACHE_MAXSIZE,
+    user_ttl=AUTH_USER_CACHE_TTL_SECONDS,
+)
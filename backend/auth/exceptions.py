@@ -43,3 +43,15 @@ class UserNotFoundByIdException(HTTPException):
             status_code=404,
             detail="Active user by this id not found.",
         )
+
+
+class HashingPoolBusyException(HTTPException):
+    """Password hashing queue is full."""
+
+    def __init__(self) -> None:
+        """Initialize the HashingPoolBusyException with status 503."""
+        super().__init__(
+            status_code=503,
+            detail="Too many authentication requests, try again later.",
+            headers={"Retry-After": "1"},
+        )
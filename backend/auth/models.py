@@ -1,6 +1,7 @@
 import uuid
+from datetime import datetime
 
-from base.models import BaseTimeStampModel
+from base.models import BaseTimeStampModel, Timestamp
 from sqlalchemy import ForeignKey, Integer, String
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column
@@ -31,10 +32,13 @@ class RefreshTokenModel(BaseTimeStampModel):
 
     __tablename__ = "refresh_tokens"
 
-    refresh_token: Mapped[uuid.UUID] = mapped_column(UUID, index=True)
-    expires_in: Mapped[float]
+    refresh_token: Mapped[uuid.UUID] = mapped_column(
+        UUID, unique=True, index=True
+    )
+    expires_at: Mapped[datetime] = mapped_column(Timestamp, index=True)
 
     user_id: Mapped[int] = mapped_column(
         Integer,
         ForeignKey("users.id", ondelete="CASCADE"),
+        unique=True,
     )
@@ -1,4 +1,11 @@
+import uuid
+from datetime import datetime
+from typing import Any
+
 from base.repository import SQLAlchemyRepository
+from sqlalchemy import delete, exists, func, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 
 from auth.models import RefreshTokenModel, UserModel
 
@@ -9,3 +16,66 @@ class UserRepository(SQLAlchemyRepository):
 
 class AuthRepository(SQLAlchemyRepository):
     model = RefreshTokenModel
+
+    async def upsert_for_user(self, data: dict[str, Any]) -> None:
+        """Insert the refresh token of a user, replacing the previous one."""
+        async with self._session_scope() as session:
+            conn = await session.connection()
+            insert = (
+                pg_insert
+                if conn.dialect.name == "postgresql"
+                else sqlite_insert
+            )
+            stmt = insert(RefreshTokenModel).values(**data)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[RefreshTokenModel.user_id],
+                set_={
+                    "refresh_token": stmt.excluded.refresh_token,
+                    "expires_at": stmt.excluded.expires_at,
+                    "updated_at": func.now(),
+                },
+            )
+            await session.execute(stmt)
+
+    async def rotate(
+        self,
+        refresh_token: uuid.UUID,
+        new_refresh_token: uuid.UUID,
+        expires_at: datetime,
+    ) -> int | None:
+        """Swap a live refresh token of an active user for a new one.
+
+        Returns the owner's id, or None when the token is unknown, expired or
+        belongs to an inactive user. Lookup and update are one statement, so
+        two concurrent refreshes cannot both use the same token.
+        """
+        stmt = (
+            update(RefreshTokenModel)
+            .where(
+                RefreshTokenModel.refresh_token == refresh_token,
+                RefreshTokenModel.expires_at > func.now(),
+                exists().where(
+                    UserModel.id == RefreshTokenModel.user_id,
+                    UserModel.is_active,
+                ),
+            )
+            .values(refresh_token=new_refresh_token, expires_at=expires_at)
+            .returning(RefreshTokenModel.user_id)
+        )
+        async with self._session_scope() as session:
+            result = await session.execute(stmt)
+            return result.scalar_one_or_none()
+
+    async def delete_expired(self, limit: int) -> int:
+        """Delete up to ``limit`` expired refresh tokens; return how many."""
+        expired = (
+            select(RefreshTokenModel.id)
+            .where(RefreshTokenModel.expires_at <= func.now())
+            .limit(limit)
+            .scalar_subquery()
+        )
+        async with self._session_scope() as session:
+            result = await session.execute(
+                delete(RefreshTokenModel).where(RefreshTokenModel.id.in_(expired))
+            )
+            return result.rowcount or 0
@@ -6,6 +6,7 @@ from core.settings import API_URL, MAX_AGE_ACCESS_TOKEN, MAX_AGE_REFRESH_TOKEN
 from fastapi import APIRouter, Depends, Request, Response, status
 from fastapi.security import OAuth2PasswordRequestForm
 
+from auth.dependencies import get_user_from_jwt
 from auth.exceptions import RefreshTokenException
 from auth.models import UserModel
 from auth.schemas import CreateUserRequestSchema, Token, UserResponseSchema
@@ -14,6 +15,17 @@ from auth.services import AuthService, UserService
 auth_router = APIRouter(prefix=f"{API_URL}/auth", tags=["auth"])
 
 
+def _refresh_token_cookie(request: Request) -> uuid.UUID:
+    """Return the refresh token cookie, rejecting missing or malformed ones."""
+    raw_token = request.cookies.get("refresh_token")
+    if not raw_token:
+        raise RefreshTokenException
+    try:
+        return uuid.UUID(raw_token)
+    except ValueError:
+        raise RefreshTokenException from None
+
+
 @auth_router.post(
     "/register",
     description="Create a new user",
@@ -64,7 +76,7 @@ async def refresh_token(
 ) -> Token:
     """Refresh the access and refresh tokens."""
     token: Token = await service.refresh_token(
-        refresh_token=uuid.UUID(request.cookies.get("refresh_token")),
+        refresh_token=_refresh_token_cookie(request),
     )
     response.set_cookie(
         "access_token",
@@ -88,11 +100,24 @@ async def logout_user(
     service: Annotated[AuthService, Depends(get_service(AuthService))],
 ) -> dict[str, str]:
     """Log out the user."""
-    raw_token = request.cookies.get("refresh_token")
-    if not raw_token:
-        raise RefreshTokenException
-
-    await service.logout_user(str(raw_token))
+    await service.logout_user(_refresh_token_cookie(request))
     response.delete_cookie("access_token")
     response.delete_cookie("refresh_token")
     return {"message": "Logged out successfully"}
+
+
+@auth_router.delete(path="/me", response_model=dict[str, str])
+async def deactivate_current_user(
+    response: Response,
+    user: Annotated[UserModel, Depends(get_user_from_jwt)],
+    service: Annotated[UserService, Depends(get_service(UserService))],
+) -> dict[str, str]:
+    """Deactivate the current user's account.
+
+    Cached claims of the user are dropped, so access tokens that have not
+    expired yet stop working on the next request.
+    """
+    await service.deactivate_user(user.id)
+    response.delete_cookie("access_token")
+    response.delete_cookie("refresh_token")
+    return {"message": "Account deactivated"}
@@ -1,4 +1,5 @@
 import uuid
+from datetime import datetime
 
 from base.schema import BaseSchema
 from pydantic import Field
@@ -30,9 +31,10 @@ class CreateRefreshTokenSchema(BaseSchema):
     """Pydantic model for creating a new refresh token session.
 
     This schema defines the structure for creating a new refresh token session
-    in the database. It includes the user ID, refresh token value.
+    in the database. It includes the user ID, refresh token value and the
+    absolute expiry time.
     """
 
     user_id: int
     refresh_token: uuid.UUID
-    expires_in: float
+    expires_at: datetime
@@ -1,5 +1,24 @@
+import asyncio
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import (
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+)
+
+from core.metrics import PASSWORD_HASH_REJECTED, PASSWORD_HASH_SECONDS
+from core.settings import (
+    PASSWORD_HASH_EXECUTOR,
+    PASSWORD_HASH_MAX_QUEUE,
+    PASSWORD_HASH_WORKERS,
+)
 from passlib.context import CryptContext
 
+from auth.exceptions import HashingPoolBusyException
+
 
 class Hasher:
     """Utility class for password hashing and verification."""
@@ -31,3 +50,106 @@ class Hasher:
         :return: True if hashed password identical to raw, false otherwise
         """
         return cls._crypt_context.verify(unhashed_password, hashed_password)
+
+    @classmethod
+    async def hash_password_async(
+        cls: type["Hasher"],
+        unhashed_password: str,
+    ) -> str:
+        """Hash a password on the hashing pool without blocking the loop.
+
+        :param unhashed_password: A password to hash
+        :return: hashed password
+        """
+        return await hashing_pool.run(cls.hash_password, unhashed_password)
+
+    @classmethod
+    async def verify_password_async(
+        cls: type["Hasher"],
+        unhashed_password: str,
+        hashed_password: str,
+    ) -> bool:
+        """Verify a password on the hashing pool without blocking the loop.
+
+        :param unhashed_password: Raw password
+        :param hashed_password: Hashed password
+        :return: True if hashed password identical to raw, false otherwise
+        """
+        return await hashing_pool.run(
+            cls.verify_password,
+            unhashed_password,
+            hashed_password,
+        )
+
+
+class HashingPool:
+    """Bounded executor for CPU heavy password hashing.
+
+    At most ``workers`` hashes run at once and ``max_queue`` more may wait;
+    anything beyond that is rejected straight away with a 503 instead of
+    piling up behind a login storm. A slot is held until the hash itself
+    finishes, even when the caller gave up waiting for it.
+    """
+
+    def __init__(self, kind: str, workers: int, max_queue: int) -> None:
+        """Run hashes on ``workers`` threads or processes, per ``kind``."""
+        self.kind = kind
+        self.workers = workers
+        self.max_queue = max_queue
+        self.in_flight = 0
+        self._lock = threading.Lock()
+        self._executor: Executor | None = None
+
+    @property
+    def executor(self) -> Executor:
+        """Return the executor, starting it on first use."""
+        if self._executor is None:
+            executor_cls = (
+                ProcessPoolExecutor
+                if self.kind == "process"
+                else ThreadPoolExecutor
+            )
+            self._executor = executor_cls(max_workers=self.workers)
+        return self._executor
+
+    async def run[Result](
+        self,
+        func: Callable[..., Result],
+        *args: str,
+    ) -> Result:
+        """Run ``func`` on the pool and record how long the hash took."""
+        with self._lock:
+            if self.in_flight >= self.workers + self.max_queue:
+                PASSWORD_HASH_REJECTED.inc()
+                raise HashingPoolBusyException
+            self.in_flight += 1
+        started = time.perf_counter()
+
+        def _release(_: Future[Result]) -> None:
+            # Runs when the job finishes or is cancelled before it starts,
+            # not when the awaiting caller is cancelled.
+            PASSWORD_HASH_SECONDS.observe(time.perf_counter() - started)
+            with self._lock:
+                self.in_flight -= 1
+
+        try:
+            future = self.executor.submit(func, *args)
+        except Exception:
+            with self._lock:
+                self.in_flight -= 1
+            raise
+        future.add_done_callback(_release)
+        return await asyncio.wrap_future(future)
+
+    def shutdown(self) -> None:
+        """Stop the executor; a later call to ``run`` starts a new one."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+hashing_pool = HashingPool(
+    kind=PASSWORD_HASH_EXECUTOR,
+    workers=PASSWORD_HASH_WORKERS,
+    max_queue=PASSWORD_HASH_MAX_QUEUE,
+)
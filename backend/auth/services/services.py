@@ -5,6 +5,7 @@ from base.abstract import AbstractRepository
 from base.services import BaseService
 from sqlalchemy.ext.asyncio.session import AsyncSession
 
+from auth.cache import auth_cache
 from auth.exceptions import (
     RefreshTokenException,
     UserNotFoundByIdException,
@@ -22,37 +23,59 @@ class UserService(BaseService):
 
     def __init__(self, db_session: AsyncSession, repo: AbstractRepository = None):
         super().__init__(db_session)
-        self.repo = repo or UserRepository()
+        self.repo = repo or UserRepository(db_session)
 
     async def create_new_user(self, user: CreateUserRequestSchema) -> int:
         """Retrieve a user by their ID from the database."""
         users_dict = user.model_dump()
-        users_dict["password"] = Hasher.hash_password(users_dict["password"])
-        return await self.repo.create_one(users_dict)
+        users_dict["password"] = await Hasher.hash_password_async(
+            users_dict["password"]
+        )
+        new_user = await self.repo.create_one(users_dict)
+        await self.commit()
+        return new_user
 
     async def get_user_by_id(self, user_id: int) -> UserModel:
-        """Retrieve a user by their ID from the database."""
-        async with self.session.begin():
-            user: UserModel | None = await self.repo.get_one(id=user_id)
+        """Retrieve a user by their ID, served from the cache when possible.
+
+        The returned model is a detached snapshot without the password hash.
+        """
+        cached: UserModel | None = auth_cache.get_user(user_id)
+        if cached:
+            return cached
+        user: UserModel | None = await self.repo.get_one(id=user_id)
         if not user:
             raise UserNotFoundByIdException
-        return user
+        return auth_cache.set_user(user)
+
+    async def deactivate_user(self, user_id: int) -> None:
+        """Deactivate a user and drop everything cached about them."""
+        user: UserModel | None = await self.repo.update(
+            {"is_active": False},
+            id=user_id,
+        )
+        if not user:
+            raise UserNotFoundByIdException
+        await self.commit()
+        auth_cache.invalidate_user(user_id)
 
 
 class AuthService(BaseService):
     def __init__(self, db_session: AsyncSession, repo: AbstractRepository = None):
         super().__init__(db_session)
-        self.repo = repo or AuthRepository()
-        self.user_repo = UserRepository()
+        self.repo = repo or AuthRepository(db_session)
+        self.user_repo = UserRepository(db_session)
 
     def auth_repo(self) -> AuthRepository:
         """Return the AuthDAO instance."""
         return self.repo
 
     @staticmethod
-    def _verify_user_password(user: UserModel | None, password: str) -> None:
+    async def _verify_user_password(user: UserModel | None, password: str) -> None:
         """Verify that the given password matches the user's password."""
-        if not user or not Hasher.verify_password(password, user.password):
+        if not user or not await Hasher.verify_password_async(
+            password, user.password
+        ):
             raise WrongCredentialsException
 
     async def auth_user(self, username: str, password: str) -> UserModel:
@@ -60,28 +83,34 @@ class AuthService(BaseService):
         user: UserModel | None = await self.user_repo.get_one(
             username=username, is_active=True
         )
-        self._verify_user_password(user, password)
+        await self._verify_user_password(user, password)
         return cast(UserModel, user)
 
     @staticmethod
-    def _get_user_id_from_jwt(decoded_jwt: dict[str, str | int]) -> str:
+    def _get_user_id_from_jwt(decoded_jwt: dict[str, str | int]) -> int:
         """Extract and return user ID from a decoded JWT payload."""
         user_id: int | str | None = decoded_jwt.get("sub")
-        if not user_id or isinstance(user_id, int):
+        if not user_id or not isinstance(user_id, str) or not user_id.isdigit():
             raise WrongCredentialsException
-        return user_id
+        return int(user_id)
 
     async def validate_token_for_user(self, user_jwt_token: str) -> int:
         """Validate a JWT token and retrieve the associated user.
 
         This method decodes the provided JWT token, validates its expiration,
-        and retrieves the associated user from the database.
+        and retrieves the associated user from the database. Verified claims
+        are cached until the token expires.
         """
-        decoded_jwt: dict[str, str | int] = TokenManager.decode_access_token(
-            token=user_jwt_token,
+        decoded_jwt: dict[str, str | int] | None = auth_cache.get_claims(
+            user_jwt_token,
         )
-        TokenManager.validate_access_token_expired(decoded_jwt)
-        user_id: uuid.UUID | str = self._get_user_id_from_jwt(decoded_jwt)
+        if decoded_jwt is None:
+            decoded_jwt = TokenManager.decode_access_token(
+                token=user_jwt_token,
+            )
+            TokenManager.validate_access_token_expired(decoded_jwt)
+            auth_cache.set_claims(user_jwt_token, decoded_jwt)
+        user_id: int = self._get_user_id_from_jwt(decoded_jwt)
         if not user_id:
             raise WrongCredentialsException
         return user_id
@@ -89,24 +118,18 @@ class AuthService(BaseService):
     async def create_token(self, user_id: int) -> Token:
         """Generate new access and refresh tokens for a user.
 
-        This method creates a new pair of tokens (access and refresh)
-        for the given user,
-        deletes any existing refresh tokens for that user,
-         and stores the new refresh token
-        in the database.
-
-
+        The new refresh token replaces any previous one of the user in a
+        single upsert.
         """
         access_token: str = TokenManager.generate_access_token(user_id=user_id)
-        refresh_token, tm_delta = TokenManager.generate_refresh_token()
+        refresh_token, expires_at = TokenManager.generate_refresh_token()
         create_token_schema = CreateRefreshTokenSchema(
             user_id=user_id,
             refresh_token=refresh_token,
-            expires_in=tm_delta.total_seconds(),
+            expires_at=expires_at,
         )
-
-        await self.repo.delete(RefreshTokenModel.user_id == user_id)
-        await self.repo.create_one(create_token_schema.model_dump())
+        await self.repo.upsert_for_user(create_token_schema.model_dump())
+        await self.commit()
         return Token(
             access_token=access_token,
             refresh_token=str(refresh_token),
@@ -114,45 +137,30 @@ class AuthService(BaseService):
 
     async def refresh_token(self, refresh_token: uuid.UUID) -> Token:
         """Generate new access and refresh tokens.
-        This method validates the provided refresh token, checks
-         if it exists and hasn't expired,
-        then generates new access and refresh tokens for the user.
+
+        The refresh token is rotated with one atomic UPDATE that only matches
+        an unexpired token of an active user.
         """
-        refresh_token_model: RefreshTokenModel | None = await self.repo.get_one(
-            refresh_token=refresh_token,
-        )
-        if not refresh_token_model:
-            raise RefreshTokenException
-        TokenManager.validate_refresh_token_expired(
-            refresh_token_model=refresh_token_model,
+        new_refresh_token, expires_at = TokenManager.generate_refresh_token()
+        user_id: int | None = await self.repo.rotate(
+            refresh_token,
+            new_refresh_token,
+            expires_at,
         )
-        user_id: int = refresh_token_model.user_id
-        user: UserModel | None = await self.repo.get_one(
-            id=user_id,
-        )
-        if not user:
+        if user_id is None:
             raise RefreshTokenException
+        await self.commit()
         access_token: str = TokenManager.generate_access_token(
             user_id=user_id,
         )
-        updated_refresh_token, tm_delta = TokenManager.generate_refresh_token()
-        updated_refresh_token_model: RefreshTokenModel | None = await self.repo.update(
-            {
-                "refresh_token": updated_refresh_token,
-                "expires_in": tm_delta.total_seconds(),
-            },
-            id=refresh_token_model.id,
-        )
-        if not updated_refresh_token_model:
-            raise RefreshTokenException
         return Token(
             access_token=access_token,
-            refresh_token=str(updated_refresh_token),
+            refresh_token=str(new_refresh_token),
         )
 
     async def logout_user(
         self,
-        refresh_token: str | None,
+        refresh_token: uuid.UUID | None,
     ) -> None:
         """Log out a user by invalidating their refresh token."""
         if not refresh_token:
@@ -165,3 +173,5 @@ class AuthService(BaseService):
         await self.repo.delete(
             id=refresh_token_model.id,
         )
+        await self.commit()
+        auth_cache.invalidate_user(refresh_token_model.user_id)
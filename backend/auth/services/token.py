@@ -12,10 +12,8 @@ from jose import JWTError, jwt
 
 from auth.exceptions import (
     AccessTokenExpiredException,
-    RefreshTokenException,
     WrongCredentialsException,
 )
-from auth.models import RefreshTokenModel
 
 type access_token = dict[str, str | datetime]
 
@@ -44,11 +42,13 @@ class TokenManager:
         return f"Bearer {encoded_jwt}"
 
     @classmethod
-    def generate_refresh_token(cls) -> tuple[uuid.UUID, timedelta]:
+    def generate_refresh_token(cls) -> tuple[uuid.UUID, datetime]:
         """
-        Generate a new refresh token and its expiration time.
+        Generate a new refresh token and the moment it expires.
         """
-        return uuid.uuid4(), timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS)
+        return uuid.uuid4(), datetime.now(UTC) + timedelta(
+            days=REFRESH_TOKEN_EXPIRE_DAYS
+        )
 
     @classmethod
     def decode_access_token(cls, token: str) -> dict[str, str | int]:
@@ -77,18 +77,3 @@ class TokenManager:
         current_time: int = timegm(datetime.now(UTC).utctimetuple())
         if not jwt_exp_date or current_time >= jwt_exp_date:
             raise AccessTokenExpiredException
-
-    @classmethod
-    def validate_refresh_token_expired(
-        cls,
-        refresh_token_model: RefreshTokenModel,
-    ) -> None:
-        """
-        Check if the refresh token has expired.
-        """
-        current_date = datetime.now(UTC)  # aware
-        refresh_token_expire_date = refresh_token_model.created_at.replace(
-            tzinfo=UTC
-        ) + timedelta(seconds=refresh_token_model.expires_in)
-        if current_date >= refresh_token_expire_date:
-            raise RefreshTokenException
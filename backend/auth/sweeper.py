@@ -0,0 +1,42 @@
+"""Background deletion of expired refresh tokens."""
+
+import asyncio
+import logging
+
+from core.settings import (
+    REFRESH_TOKEN_SWEEP_BATCH_SIZE,
+    REFRESH_TOKEN_SWEEP_INTERVAL,
+)
+
+from auth.repository import AuthRepository
+
+logger = logging.getLogger(__name__)
+
+
+async def sweep_expired_refresh_tokens(
+    batch_size: int = REFRESH_TOKEN_SWEEP_BATCH_SIZE,
+) -> int:
+    """Delete every expired refresh token in short batched transactions."""
+    repo = AuthRepository()
+    total = 0
+    while True:
+        deleted = await repo.delete_expired(batch_size)
+        total += deleted
+        if deleted < batch_size:
+            return total
+        await asyncio.sleep(0)
+
+
+async def run_refresh_token_sweeper(
+    interval: float = REFRESH_TOKEN_SWEEP_INTERVAL,
+) -> None:
+    """Sweep expired refresh tokens every ``interval`` seconds."""
+    while True:
+        try:
+            deleted = await sweep_expired_refresh_tokens()
+        except Exception:
+            logger.exception("Refresh token sweep failed.")
+        else:
+            if deleted:
+                logger.info("Deleted %s expired refresh tokens.", deleted)
+        await asyncio.sleep(interval)
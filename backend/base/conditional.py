@@ -0,0 +1,87 @@
+"""ETag and Last-Modified validators for conditional GETs."""
+
+import datetime as dt
+import hashlib
+from collections.abc import Iterable, Sequence
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any
+
+from fastapi import Request, Response, status
+
+
+def make_etag(parts: Iterable[object]) -> str:
+    """Return a weak ETag digest of the given version parts."""
+    digest = hashlib.blake2b(digest_size=12)
+    for part in parts:
+        digest.update(part if isinstance(part, bytes) else str(part).encode())
+        digest.update(b"\x1f")
+    return f'W/"{digest.hexdigest()}"'
+
+
+def _as_utc(value: dt.datetime) -> dt.datetime:
+    # SQLite hands back naive timestamps, which are UTC.
+    if value.tzinfo is None:
+        return value.replace(tzinfo=dt.UTC)
+    return value.astimezone(dt.UTC)
+
+
+def http_date(value: dt.datetime) -> str:
+    """Format a timestamp for the Last-Modified header."""
+    return format_datetime(_as_utc(value), usegmt=True)
+
+
+def page_validators(
+    rows: Sequence[Any],
+    body: bytes,
+) -> tuple[str, dt.datetime | None]:
+    """Return the ETag and Last-Modified of a rendered page of rows.
+
+    The ETag digests the body itself: ``updated_at`` only has second
+    precision on SQLite, so two writes within a second would share it.
+    """
+    last_modified = max((row.updated_at for row in rows), default=None)
+    return make_etag((body,)), last_modified
+
+
+def validator_headers(
+    etag: str,
+    last_modified: dt.datetime | None,
+) -> dict[str, str]:
+    """Return the ETag and Last-Modified headers of a representation."""
+    headers = {"ETag": etag}
+    if last_modified is not None:
+        headers["Last-Modified"] = http_date(last_modified)
+    return headers
+
+
+def is_not_modified(
+    request: Request,
+    etag: str,
+    last_modified: dt.datetime | None,
+) -> bool:
+    """Evaluate If-None-Match, or else If-Modified-Since (RFC 9110)."""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        if if_none_match.strip() == "*":
+            return True
+        opaque = etag.removeprefix("W/")
+        return any(
+            candidate.strip().removeprefix("W/") == opaque
+            for candidate in if_none_match.split(",")
+        )
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since is None or last_modified is None:
+        return False
+    try:
+        since = _as_utc(parsedate_to_datetime(if_modified_since))
+    except (TypeError, ValueError):
+        return False
+    return _as_utc(last_modified).replace(microsecond=0) <= since
+
+
+def not_modified(etag: str, last_modified: dt.datetime | None) -> Response:
+    """Return an empty 304 carrying the current validators."""
+    return Response(
+        status_code=status.HTTP_304_NOT_MODIFIED,
+        headers=validator_headers(etag, last_modified),
+    )
@@ -2,8 +2,21 @@ from datetime import datetime
 
 from core.db import Base
 from sqlalchemy import TIMESTAMP, func
+from sqlalchemy.dialects.sqlite import DATETIME as SQLITE_DATETIME
 from sqlalchemy.orm import Mapped, mapped_column
 
+# SQLite fills func.now() with CURRENT_TIMESTAMP, which has no fraction of a
+# second; bound datetimes must use the same text format to compare correctly.
+Timestamp = TIMESTAMP(timezone=True).with_variant(
+    SQLITE_DATETIME(
+        storage_format=(
+            "%(year)04d-%(month)02d-%(day)02d "
+            "%(hour)02d:%(minute)02d:%(second)02d"
+        ),
+    ),
+    "sqlite",
+)
+
 
 class BaseIDModel(Base):
     """Base model for a UUID primary key."""
@@ -18,11 +31,11 @@ class BaseTimeStampModel(BaseIDModel):
     __abstract__ = True
 
     created_at: Mapped[datetime] = mapped_column(
-        TIMESTAMP(timezone=True),
+        Timestamp,
         default=func.now(),
     )
     updated_at: Mapped[datetime] = mapped_column(
-        TIMESTAMP(timezone=True),
+        Timestamp,
         server_default=func.now(),
         onupdate=func.now(),
     )
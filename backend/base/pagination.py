@@ -0,0 +1,54 @@
+"""Opaque keyset pagination cursors."""
+
+import base64
+import binascii
+import datetime as dt
+import json
+from collections.abc import Sequence
+from typing import Any
+
+from books.exceptions import InvalidCursorException
+
+
+def encode_cursor(
+    sort_by: str,
+    values: Sequence[Any],
+    *,
+    descending: bool,
+) -> str:
+    """Pack the sort key of the last row of a page into an opaque cursor."""
+    payload = json.dumps(
+        [sort_by, descending, *values],
+        default=lambda value: value.isoformat(),
+        separators=(",", ":"),
+    )
+    return base64.urlsafe_b64encode(payload.encode()).rstrip(b"=").decode()
+
+
+def decode_cursor(
+    cursor: str,
+    sort_by: str,
+    types: Sequence[type],
+    *,
+    descending: bool,
+) -> tuple[Any, ...]:
+    """Unpack a cursor made by ``encode_cursor`` for the same ordering.
+
+    Values are converted back to ``types``; a cursor issued for another sort
+    key or direction is rejected.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        key, direction, *values = json.loads(raw)
+        if key != sort_by or direction is not descending:
+            raise InvalidCursorException
+        if len(values) != len(types):
+            raise InvalidCursorException
+        return tuple(
+            dt.datetime.fromisoformat(value)
+            if type_ is dt.datetime
+            else type_(value)
+            for value, type_ in zip(values, types, strict=True)
+        )
+    except (binascii.Error, ValueError, TypeError):
+        raise InvalidCursorException from None
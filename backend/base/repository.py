@@ -1,27 +1,74 @@
 import datetime as dt
-from collections.abc import Sequence
+import inspect
+from collections.abc import AsyncIterator, Sequence
+from contextlib import asynccontextmanager
 from typing import Any, TypeVar, cast
 
 from core.db import Base, new_session
-from sqlalchemy import Result, Select, and_, or_, select
+from core.metrics import timed_operation
+from sqlalchemy import Result, Select, and_, or_, select, tuple_
 from sqlalchemy import delete as sa_delete
 from sqlalchemy import update as sa_update
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.sql.expression import insert
 
 from base.abstract.repository import AbstractRepository
+from base.pagination import decode_cursor, encode_cursor
 
 Model = TypeVar("Model", bound=Base)
 
 
+def _instrument(cls: type) -> None:
+    """Time every public coroutine method defined directly on ``cls``.
+
+    Private helpers run inside public methods, so timing them too would
+    record the same statements twice.
+    """
+    for name, attr in list(vars(cls).items()):
+        if (
+            not name.startswith("_")
+            and inspect.iscoroutinefunction(attr)
+            and not getattr(attr, "__timed__", False)
+        ):
+            setattr(cls, name, timed_operation(attr))
+
+
 class SQLAlchemyRepository(AbstractRepository):
     model = None
 
-    async def create_one(self, data: dict, return_session=False) -> Model:
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        _instrument(cls)
+
+    def __init__(self, session: AsyncSession | None = None) -> None:
+        """Bind the repository to a unit-of-work session.
+
+        Without a session every call runs in its own short-lived
+        transaction, which is only meant for code running outside a request.
+        """
+        self._session: AsyncSession | None = session
+
+    @property
+    def dialect_name(self) -> str:
+        """Name of the dialect the repository's statements run on."""
+        session = self._session
+        bind = session.bind if session is not None else None
+        return (bind or new_session.kw["bind"]).dialect.name
+
+    @asynccontextmanager
+    async def _session_scope(self) -> AsyncIterator[AsyncSession]:
+        """Yield the bound session or a standalone committed one."""
+        if self._session is not None:
+            yield self._session
+            return
+        async with new_session() as session, session.begin():
+            yield session
+
+    async def create_one(self, data: dict) -> Model:
         """Create a new one object by dict"""
-        async with new_session() as session:
+        async with self._session_scope() as session:
             stmt = insert(self.model).values(**data).returning(self.model)
             res = await session.execute(stmt)
-            await session.commit()
             return res.scalar_one()
 
     async def get_all(
@@ -36,7 +83,7 @@ class SQLAlchemyRepository(AbstractRepository):
         """"
         Get all objects by default all by parameters and return models
         """
-        async with new_session() as session:
+        async with self._session_scope() as session:
             pagination = []
             if created_at and last_id:
                 pagination = [
@@ -51,14 +98,62 @@ class SQLAlchemyRepository(AbstractRepository):
             query: Select[Any] = (
                 select(self.model).where(*filters, *pagination).filter_by(**filters_by)
             )
+            if pagination:
+                query = query.order_by(
+                    self.model.created_at.desc(),  # type: ignore
+                    self.model.id.desc(),  # type: ignore
+                )
             if limit:
                 query = query.limit(limit)
             result = await session.execute(query)
             return cast(list[Model], result.scalars().all())
 
+    async def get_page(
+        self,
+        sort_by: str,
+        limit: int,
+        cursor: str | None = None,
+        *,
+        descending: bool = True,
+        filters: Sequence[Any] = (),
+    ) -> tuple[list[Model], str | None]:
+        """Return one keyset page ordered by ``(sort_by, id)``.
+
+        The cursor carries the sort key of the last row of the previous page,
+        so every page is a range scan on the matching composite index no
+        matter how deep it is.
+        """
+        keys = (getattr(self.model, sort_by), self.model.id)
+        query: Select[Any] = select(self.model).where(*filters)
+        if cursor:
+            after = decode_cursor(
+                cursor,
+                sort_by,
+                [key.type.python_type for key in keys],
+                descending=descending,
+            )
+            query = query.where(
+                tuple_(*keys) < after if descending else tuple_(*keys) > after
+            )
+        query = query.order_by(
+            *(key.desc() if descending else key.asc() for key in keys)
+        ).limit(limit + 1)
+
+        async with self._session_scope() as session:
+            result = await session.execute(query)
+            rows = cast(list[Model], list(result.scalars()))
+
+        if len(rows) <= limit:
+            return rows, None
+        rows = rows[:limit]
+        last = rows[-1]
+        return rows, encode_cursor(
+            sort_by, (getattr(last, sort_by), last.id), descending=descending
+        )
+
     async def _get(self, *filters: Any, **filters_by: Any) -> Result[Any]:
         """Execute a database query with the specified filters."""
-        async with new_session() as session:
+        async with self._session_scope() as session:
             query: Select[Any] = (
                 select(self.model).where(*filters).filter_by(**filters_by)
             )
@@ -76,7 +171,7 @@ class SQLAlchemyRepository(AbstractRepository):
         **filters_by: Any,
     ) -> Model | None:
         """Update records matching the specified filters with provided data."""
-        async with new_session() as session:
+        async with self._session_scope() as session:
             cols = {c.key for c in self.model.__mapper__.column_attrs}
             payload = {k: v for k, v in update_data.items() if k in cols}
 
@@ -95,15 +190,15 @@ class SQLAlchemyRepository(AbstractRepository):
 
             obj_id = row[0]
 
-            return await session.get(self.model, obj_id)
+            return await session.get(self.model, obj_id, populate_existing=True)
 
     async def delete(
         self,
         *filters: Any,
         **filters_by: Any,
-    ) -> None:
+    ) -> int:
         """Delete records matching the specified filters."""
-        async with new_session() as session:
+        async with self._session_scope() as session:
             stmt = sa_delete(self.model).where(*filters).filter_by(**filters_by)
             res = await session.execute(stmt)
 
@@ -113,7 +208,7 @@ class SQLAlchemyRepository(AbstractRepository):
         """"
         Get ids by lst
         """
-        async with new_session() as session:
+        async with self._session_scope() as session:
             res = await session.execute(
                 select(self.model).where(self.model.name.in_(lst))
             )
@@ -127,7 +222,7 @@ class SQLAlchemyRepository(AbstractRepository):
     ):
         """Add many to many field to object
         """
-        async with new_session() as session:
+        async with self._session_scope() as session:
             obj = await session.merge(obj)
             items_attached = [await session.merge(it) for it in items]
 
@@ -137,6 +232,9 @@ class SQLAlchemyRepository(AbstractRepository):
                 if it not in existing:
                     rel_list.append(it)
 
-            await session.commit()
+            await session.flush()
             await session.refresh(obj)
             return obj
+
+
+_instrument(SQLAlchemyRepository)
@@ -0,0 +1,13 @@
+"""Responses for bodies rendered to JSON bytes up front."""
+
+from fastapi import Response
+
+
+class RenderedJSONResponse(Response):
+    """JSON body that was already rendered to bytes.
+
+    Returning it from a route skips ``response_model`` validation and
+    serialization; the route's ``response_model`` still documents the shape.
+    """
+
+    media_type = "application/json"
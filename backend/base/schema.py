@@ -8,5 +8,12 @@ class BaseSchema(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 
+class PageSchema[Item](BaseModel):
+    """One page of a keyset paginated listing."""
+
+    items: list[Item]
+    next_cursor: str | None = None
+
+
 class DeleteResponse(BaseModel):
     status: str
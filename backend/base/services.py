@@ -17,6 +17,14 @@ class BaseService:
         """Return the current AsyncSession."""
         return self._session
 
+    async def commit(self) -> None:
+        """Commit the request unit of work.
+
+        Repositories bound to the session only flush, so every write issued
+        during the request is persisted together here.
+        """
+        await self._session.commit()
+
     @staticmethod
     @final
     def _validate_schema_for_update_request(
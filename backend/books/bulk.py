@@ -0,0 +1,112 @@
+"""Streaming parser and batching for bulk book uploads."""
+
+import codecs
+import json
+from collections.abc import AsyncIterable, AsyncIterator
+from typing import Any
+
+from books.exceptions import BulkUploadException
+
+# Largest undecodable tail kept in memory while waiting for more bytes.
+MAX_PENDING_CHARS = 1024 * 1024
+
+_decoder = json.JSONDecoder()
+_WHITESPACE = " \t\n\r"
+
+
+class _ArrayReader:
+    """Incrementally decoded request body, read a JSON token at a time."""
+
+    def __init__(self, chunks: AsyncIterable[bytes]) -> None:
+        self._chunks = aiter(chunks)
+        self._utf8 = codecs.getincrementaldecoder("utf-8")()
+        self._buffer = ""
+        self._pos = 0
+        self._more = True
+
+    async def _feed(self) -> None:
+        """Append the next chunk, dropping what has already been read."""
+        chunk = await anext(self._chunks, None)
+        self._more = chunk is not None
+        try:
+            text = self._utf8.decode(chunk or b"", final=not self._more)
+        except UnicodeDecodeError:
+            raise BulkUploadException from None
+        self._buffer = self._buffer[self._pos:] + text
+        self._pos = 0
+
+    async def peek(self) -> str | None:
+        """Return the next non-whitespace character, None at the end."""
+        while True:
+            while (
+                self._pos < len(self._buffer)
+                and self._buffer[self._pos] in _WHITESPACE
+            ):
+                self._pos += 1
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._more:
+                return None
+            await self._feed()
+
+    async def take(self) -> str | None:
+        """Consume and return the next non-whitespace character."""
+        char = await self.peek()
+        if char is not None:
+            self._pos += 1
+        return char
+
+    async def read_object(self) -> dict[str, Any]:
+        """Decode the JSON object starting at the next character."""
+        if await self.peek() != "{":
+            raise BulkUploadException
+        while True:
+            try:
+                item, self._pos = _decoder.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError:
+                pending = len(self._buffer) - self._pos
+                if not self._more or pending > MAX_PENDING_CHARS:
+                    raise BulkUploadException from None
+                await self._feed()
+            else:
+                return item
+
+
+async def iter_json_array(
+    chunks: AsyncIterable[bytes],
+) -> AsyncIterator[dict[str, Any]]:
+    """Yield the objects of a JSON array while the body is still arriving.
+
+    Only the current, not yet decoded object is buffered, so memory does not
+    depend on the size of the upload.
+    """
+    reader = _ArrayReader(chunks)
+    if await reader.take() != "[":
+        raise BulkUploadException
+    if await reader.peek() == "]":
+        await reader.take()
+    else:
+        while True:
+            yield await reader.read_object()
+            separator = await reader.take()
+            if separator == "]":
+                break
+            if separator != ",":
+                raise BulkUploadException
+    if await reader.peek() is not None:
+        raise BulkUploadException
+
+
+async def batched[T](
+    items: AsyncIterable[T],
+    size: int,
+) -> AsyncIterator[list[T]]:
+    """Group an async iterable into lists of at most ``size`` items."""
+    batch: list[T] = []
+    async for item in items:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
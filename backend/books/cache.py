@@ -0,0 +1,109 @@
+"""Read-through cache of rendered books."""
+
+import datetime as dt
+from typing import NamedTuple
+
+from core.cache import SharedCacheBackend, TTLCache
+from core.metrics import register_cache
+from core.settings import (
+    AUTHOR_CACHE_MAXSIZE,
+    AUTHOR_CACHE_TTL_SECONDS,
+    BOOK_CACHE_MAXSIZE,
+    BOOK_CACHE_TTL_SECONDS,
+    FACETS_CACHE_TTL_SECONDS,
+)
+
+
+class CachedBook(NamedTuple):
+    """Serialized ``BookOutSchema`` together with its HTTP validators."""
+
+    payload: bytes
+    etag: str
+    last_modified: dt.datetime
+
+    def pack(self) -> bytes:
+        """Encode for the shared tier."""
+        head = f"{self.etag}\n{self.last_modified.isoformat()}\n".encode()
+        return head + self.payload
+
+    @classmethod
+    def unpack(cls, data: bytes) -> "CachedBook":
+        """Decode a value written by ``pack``."""
+        etag, last_modified, payload = data.split(b"\n", 2)
+        return cls(
+            payload,
+            etag.decode(),
+            dt.datetime.fromisoformat(last_modified.decode()),
+        )
+
+
+class BookCache:
+    """Read-through cache of serialized books.
+
+    A bounded in-process LRU sits in front of an optional shared backend.
+    Writers call ``invalidate`` after commit; every invalidation bumps
+    ``generation`` so a reader that loaded a book before the write cannot
+    store its stale copy afterwards.
+    """
+
+    key_prefix = "book:"
+
+    def __init__(
+        self,
+        maxsize: int,
+        ttl: float,
+        shared: SharedCacheBackend | None = None,
+    ) -> None:
+        """Keep ``maxsize`` books for ``ttl`` seconds, optionally shared."""
+        self.ttl = ttl
+        self.local: TTLCache[int, CachedBook] = TTLCache(maxsize, ttl=ttl)
+        self.shared = shared
+        self.generation = 0
+        register_cache("books", self.local)
+
+    def _key(self, book_id: int) -> str:
+        return f"{self.key_prefix}{book_id}"
+
+    async def get(self, book_id: int) -> CachedBook | None:
+        """Return a cached book, filling the LRU from the shared tier."""
+        book = self.local.get(book_id)
+        if book is None and self.shared is not None:
+            data = await self.shared.get(self._key(book_id))
+            if data is not None:
+                book = CachedBook.unpack(data)
+                self.local.set(book_id, book)
+        return book
+
+    async def set(
+        self, book_id: int, book: CachedBook, generation: int
+    ) -> None:
+        """Cache a book read while ``generation`` was current."""
+        if generation != self.generation:
+            return
+        self.local.set(book_id, book)
+        if self.shared is not None:
+            await self.shared.set(self._key(book_id), book.pack(), self.ttl)
+
+    async def invalidate(self, *book_ids: int) -> None:
+        """Drop books from both tiers."""
+        self.generation += 1
+        for book_id in book_ids:
+            self.local.pop(book_id)
+        if self.shared is not None and book_ids:
+            await self.shared.delete(*map(self._key, book_ids))
+
+
+book_cache = BookCache(maxsize=BOOK_CACHE_MAXSIZE, ttl=BOOK_CACHE_TTL_SECONDS)
+
+# Facet counts keyed by the JSON of their filters; cleared on every write.
+facets_cache: TTLCache[str, tuple[dict[str, int], dict[int, int]]] = TTLCache(
+    256, ttl=FACETS_CACHE_TTL_SECONDS
+)
+register_cache("book_facets", facets_cache)
+
+# Author ids by name, only filled with ids read or written by a committed
+# transaction.
+author_ids_cache: TTLCache[str, int] = TTLCache(
+    AUTHOR_CACHE_MAXSIZE, ttl=AUTHOR_CACHE_TTL_SECONDS
+)
+register_cache("author_ids", author_ids_cache)
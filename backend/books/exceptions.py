@@ -43,3 +43,25 @@ class BulkUploadException(HTTPException):
             status_code=422,
             detail='Please provide correct json [{ "title": "...", "authors": ["...","..."], "published_year": 1997 }, ...]',
         )
+
+
+class InvalidCursorException(HTTPException):
+    """Custom exception for when a pagination cursor cannot be decoded."""
+
+    def __init__(self) -> None:
+        """Initialize the InvalidCursorException with status 400."""
+        super().__init__(
+            status_code=400,
+            detail="Invalid or outdated pagination cursor",
+        )
+
+
+class InvalidBatchIdsException(HTTPException):
+    """Custom exception for a malformed or oversized list of book ids."""
+
+    def __init__(self, max_ids: int) -> None:
+        """Initialize the InvalidBatchIdsException with status 422."""
+        super().__init__(
+            status_code=422,
+            detail=f"Provide between 1 and {max_ids} comma separated book ids",
+        )
@@ -0,0 +1,17 @@
+"""Genre bitmask encoding used by GENRE_FILTER_MODE=bitmask."""
+
+from collections.abc import Iterable
+
+from core.settings import ALLOWED_GENRES
+
+GENRE_BITS: dict[str, int] = {
+    genre: 1 << position for position, genre in enumerate(ALLOWED_GENRES)
+}
+
+
+def genres_to_mask(genres: Iterable[str]) -> int:
+    """Pack allowed genre names into their ``genre_mask`` integer."""
+    mask = 0
+    for genre in genres:
+        mask |= GENRE_BITS[genre]
+    return mask
@@ -3,12 +3,17 @@ from __future__ import annotations
 from typing import List
 
 from sqlalchemy import (
+    DDL,
+    JSON,
     ForeignKey,
+    Index,
     Integer,
     String,
+    Text,
     UniqueConstraint,
+    event,
 )
-from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.dialects.postgresql import ARRAY, TSVECTOR
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from base.models import BaseTimeStampModel
@@ -20,43 +25,112 @@ class BookAuthor(Base):
     Association object between books and authors.
     """
     __tablename__ = "book_authors"
-    __table_args__ = (UniqueConstraint("book_id", "author_id", name="uq_book_author"),)
+    __table_args__ = (
+        UniqueConstraint("book_id", "author_id", name="uq_book_author"),
+        # The primary key leads with book_id; author -> books lookups and
+        # cascades from authors need their own index.
+        Index("ix_book_authors_author_id", "author_id"),
+    )
 
     book_id: Mapped[int] = mapped_column(ForeignKey("books.id", ondelete="CASCADE"),
                                          primary_key=True)
     author_id: Mapped[int] = mapped_column(ForeignKey("authors.id", ondelete="CASCADE"),
                                            primary_key=True)
 
-    book: Mapped["BookModel"] = relationship(back_populates="book_authors")
-    author: Mapped["AuthorModel"] = relationship(back_populates="author_books")
+    book: Mapped["BookModel"] = relationship(viewonly=True)
+    author: Mapped["AuthorModel"] = relationship(viewonly=True)
+
+
 
+# Trigram operator classes used by the fuzzy search indexes.
+event.listen(
+    Base.metadata,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(
+        dialect="postgresql",
+    ),
+)
 
 
 class AuthorModel(BaseTimeStampModel):
     __tablename__ = "authors"
+    __table_args__ = (
+        Index(
+            "ix_authors_name_trgm",
+            "name",
+            postgresql_using="gin",
+            postgresql_ops={"name": "gin_trgm_ops"},
+        ).ddl_if(dialect="postgresql"),
+    )
     name: Mapped[str] = mapped_column(
         String(255), nullable=False, unique=True, index=True
     )
 
-    books: Mapped[List[BookAuthor]] = relationship(
-        back_populates="book",
-        cascade="all, delete-orphan",
+    books: Mapped[List[BookModel]] = relationship(
+        secondary="book_authors",
+        back_populates="authors",
         lazy="selectin",
     )
 
 
 class BookModel(BaseTimeStampModel):
     __tablename__ = "books"
+    __table_args__ = (
+        Index(
+            "ix_books_title_trgm",
+            "title",
+            postgresql_using="gin",
+            postgresql_ops={"title": "gin_trgm_ops"},
+        ).ddl_if(dialect="postgresql"),
+        # Serves the genre filters: && (any) and @> (all).
+        Index(
+            "ix_books_genres_gin",
+            "genres",
+            postgresql_using="gin",
+        ).ddl_if(dialect="postgresql"),
+        Index(
+            "ix_books_search_vector",
+            "search_vector",
+            postgresql_using="gin",
+        ).ddl_if(dialect="postgresql"),
+    )
 
-    title: Mapped[str] = mapped_column(String(255), nullable=False, index=True)
-    published_year: Mapped[int] = mapped_column(Integer, nullable=False, index=True)
+    title: Mapped[str] = mapped_column(String(255), nullable=False)
+    published_year: Mapped[int] = mapped_column(Integer, nullable=False)
 
     genres: Mapped[list[str]] = mapped_column(
-        ARRAY(String(50)), nullable=False, server_default="{}"
+        ARRAY(String(50)).with_variant(JSON(), "sqlite"),
+        nullable=False,
+        server_default="{}",
+    )
+    # Same genres as one bit per ALLOWED_GENRES entry, see books.genres.
+    genre_mask: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        server_default="0",
+    )
+    # Title, author names and genres for full-text search, maintained on
+    # Postgres by the triggers of migration 0004. Deferred so book loads
+    # never fetch it.
+    search_vector: Mapped[str | None] = mapped_column(
+        TSVECTOR().with_variant(Text(), "sqlite"),
+        nullable=True,
+        deferred=True,
     )
 
-    authors: Mapped[List[BookAuthor]] = relationship(
-        back_populates="author",
-        cascade="all, delete-orphan",
+    authors: Mapped[List[AuthorModel]] = relationship(
+        secondary="book_authors",
+        back_populates="books",
         lazy="selectin",
     )
+
+
+# Keyset pagination indexes, one per supported sort key. The id tiebreaker
+# makes every key unique, so pages never overlap or skip rows.
+Index(
+    "ix_books_created_at_id",
+    BookModel.created_at.desc(),
+    BookModel.id.desc(),
+)
+Index("ix_books_published_year_id", BookModel.published_year, BookModel.id)
+Index("ix_books_title_id", BookModel.title, BookModel.id)
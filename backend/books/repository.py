@@ -1,11 +1,490 @@
+import datetime as dt
+from collections.abc import AsyncIterator, Collection, Sequence
+from typing import Any
+
 from base.repository import SQLAlchemyRepository
+from core.settings import GENRE_FILTER_MODE, SEARCH_TEXT_CONFIG
+from sqlalchemy import (
+    ColumnElement,
+    Integer,
+    Select,
+    TableValuedAlias,
+    distinct,
+    exists,
+    func,
+    insert,
+    literal,
+    select,
+    true,
+    union_all,
+)
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import selectinload
+
+from .genres import GENRE_BITS, genres_to_mask
+from .models import AuthorModel, BookAuthor, BookModel
 
-from .models import AuthorModel, BookModel
+
+def _genre_tags(dialect_name: str) -> TableValuedAlias:
+    """Return the genres of the outer book row as a one-column table."""
+    if dialect_name == "postgresql":
+        return (
+            func.unnest(BookModel.genres)
+            .table_valued("value")
+            .render_derived()
+        )
+    return func.json_each(BookModel.genres).table_valued("value")
 
 
 class BookRepository(SQLAlchemyRepository):
     model = BookModel
 
+    def filter_clauses(
+        self,
+        genres: Sequence[str] = (),
+        genres_match: str = "any",
+        year_from: int | None = None,
+        year_to: int | None = None,
+    ) -> list[ColumnElement[bool]]:
+        """Build WHERE clauses for the genre and publication year filters.
+
+        In bitmask mode the genre filters are bitwise tests on
+        ``genre_mask``. Otherwise Postgres uses the ``&&`` and ``@>`` array
+        operators served by the GIN index on ``genres``.
+        """
+        clauses: list[ColumnElement[bool]] = []
+        if genres:
+            genres = list(dict.fromkeys(genres))
+            match_all = genres_match == "all"
+            if GENRE_FILTER_MODE == "bitmask":
+                mask = genres_to_mask(genres)
+                matched = BookModel.genre_mask.bitwise_and(mask)
+                clauses.append(matched == mask if match_all else matched != 0)
+            elif self.dialect_name == "postgresql":
+                clauses.append(
+                    BookModel.genres.contains(genres)
+                    if match_all
+                    else BookModel.genres.overlap(genres)
+                )
+            else:
+                tags = _genre_tags(self.dialect_name)
+                if match_all:
+                    matched = (
+                        select(func.count(distinct(tags.c.value)))
+                        .where(tags.c.value.in_(genres))
+                        .scalar_subquery()
+                    )
+                    clauses.append(matched == len(genres))
+                else:
+                    clauses.append(exists().where(tags.c.value.in_(genres)))
+        if year_from is not None:
+            clauses.append(BookModel.published_year >= year_from)
+        if year_to is not None:
+            clauses.append(BookModel.published_year <= year_to)
+        return clauses
+
+    async def get_by_ids(
+        self,
+        ids: list[int],
+        filters: Sequence[ColumnElement[bool]] = (),
+    ) -> list[BookModel]:
+        """Return books with the given ids, keeping the order of ``ids``."""
+        if not ids:
+            return []
+        async with self._session_scope() as session:
+            result = await session.execute(
+                select(BookModel).where(BookModel.id.in_(ids), *filters)
+            )
+            books = {book.id: book for book in result.scalars()}
+        return [books[book_id] for book_id in ids if book_id in books]
+
+    async def filter_ids(
+        self,
+        ids: list[int],
+        filters: Sequence[ColumnElement[bool]],
+    ) -> list[int]:
+        """Return the ids of books matching ``filters``, in ``ids`` order."""
+        if not ids:
+            return []
+        async with self._session_scope() as session:
+            result = await session.execute(
+                select(BookModel.id).where(BookModel.id.in_(ids), *filters)
+            )
+            matched = set(result.scalars())
+        return [book_id for book_id in ids if book_id in matched]
+
+    async def search(
+        self,
+        query: str,
+        limit: int,
+        offset: int = 0,
+        filters: Sequence[ColumnElement[bool]] = (),
+    ) -> list[BookModel]:
+        """Fuzzy search by title or author name using pg_trgm.
+
+        Title and author matches are collected separately so each ``<%``
+        lookup is served by its own trigram GIN index, then books are ranked
+        by their best word similarity.
+        """
+        term = literal(query)
+        title_hits = select(
+            BookModel.id.label("book_id"),
+            func.word_similarity(term, BookModel.title).label("score"),
+        ).where(term.op("<%")(BookModel.title))
+        author_hits = (
+            select(
+                BookAuthor.book_id,
+                func.word_similarity(term, AuthorModel.name).label("score"),
+            )
+            .join(AuthorModel, AuthorModel.id == BookAuthor.author_id)
+            .where(term.op("<%")(AuthorModel.name))
+        )
+        hits = union_all(title_hits, author_hits).subquery()
+        ranked = (
+            select(hits.c.book_id, func.max(hits.c.score).label("score"))
+            .group_by(hits.c.book_id)
+            .subquery()
+        )
+        stmt = (
+            select(BookModel)
+            .join(ranked, ranked.c.book_id == BookModel.id)
+            .where(*filters)
+            .order_by(ranked.c.score.desc(), BookModel.id)
+            .limit(limit)
+            .offset(offset)
+        )
+        async with self._session_scope() as session:
+            result = await session.execute(stmt)
+            return list(result.scalars())
+
+    async def full_text_search(
+        self,
+        query: str,
+        limit: int,
+        offset: int = 0,
+        filters: Sequence[ColumnElement[bool]] = (),
+    ) -> list[tuple[BookModel, float, str]]:
+        """Keyword search on ``books.search_vector``, best matches first.
+
+        ``query`` takes web search syntax (quoted phrases, ``or``, ``-word``).
+        Returns ``(book, rank, headline)``; the headline is the title and
+        author names with matches wrapped in ``<mark>``, built for the
+        returned page only since ``ts_headline`` re-parses the text.
+        """
+        tsquery = func.websearch_to_tsquery(SEARCH_TEXT_CONFIG, query)
+        rank = func.ts_rank(BookModel.search_vector, tsquery)
+        hits = (
+            select(BookModel.id, rank.label("rank"))
+            .where(BookModel.search_vector.op("@@")(tsquery), *filters)
+            .order_by(rank.desc(), BookModel.id)
+            .limit(limit)
+            .offset(offset)
+            .subquery()
+        )
+        author_names = (
+            select(func.string_agg(AuthorModel.name, literal(", ")))
+            .join(BookAuthor, BookAuthor.author_id == AuthorModel.id)
+            .where(BookAuthor.book_id == BookModel.id)
+            .scalar_subquery()
+        )
+        headline = func.ts_headline(
+            SEARCH_TEXT_CONFIG,
+            func.concat_ws(" — ", BookModel.title, author_names),
+            tsquery,
+            "StartSel=<mark>, StopSel=</mark>, HighlightAll=true",
+        )
+        stmt = (
+            select(BookModel, hits.c.rank, headline)
+            .join(hits, hits.c.id == BookModel.id)
+            .order_by(hits.c.rank.desc(), BookModel.id)
+        )
+        async with self._session_scope() as session:
+            result = await session.execute(stmt)
+            return [tuple(row) for row in result]
+
+    async def facets(
+        self,
+        filters: Sequence[ColumnElement[bool]] = (),
+    ) -> tuple[dict[str, int], dict[int, int]]:
+        """Count matching books per genre and per decade in the database."""
+        decade_rows = (
+            select((BookModel.published_year // 10 * 10).label("decade"))
+            .where(*filters)
+            .subquery()
+        )
+        decade_stmt = (
+            select(decade_rows.c.decade, func.count())
+            .group_by(decade_rows.c.decade)
+            .order_by(decade_rows.c.decade)
+        )
+        async with self._session_scope() as session:
+            if GENRE_FILTER_MODE == "bitmask":
+                # One pass with a filtered count per genre bit.
+                genre_stmt: Select[*tuple[Any, ...]] = select(
+                    *(
+                        func.count()
+                        .filter(BookModel.genre_mask.bitwise_and(bit) != 0)
+                        .label(genre)
+                        for genre, bit in GENRE_BITS.items()
+                    )
+                ).where(*filters)
+            else:
+                conn = await session.connection()
+                tags = _genre_tags(conn.dialect.name)
+                genre_stmt = (
+                    select(tags.c.value, func.count())
+                    .select_from(BookModel)
+                    .join(tags, true())
+                    .where(*filters)
+                    .group_by(tags.c.value)
+                    .order_by(tags.c.value)
+                )
+            result = await session.execute(genre_stmt)
+            if GENRE_FILTER_MODE == "bitmask":
+                genres = {
+                    genre: count
+                    for genre, count in result.mappings().one().items()
+                    if count
+                }
+            else:
+                genres = dict(result.tuples().all())
+            decade_result = await session.execute(decade_stmt)
+            decades: dict[int, int] = dict(decade_result.tuples().all())
+        return genres, decades
+
+    async def stream_search_documents(
+        self,
+    ) -> AsyncIterator[tuple[int, str, str | None]]:
+        """Yield ``(book_id, title, author_name)`` rows for index building."""
+        stmt = (
+            select(BookModel.id, BookModel.title, AuthorModel.name)
+            .outerjoin(BookAuthor, BookAuthor.book_id == BookModel.id)
+            .outerjoin(AuthorModel, AuthorModel.id == BookAuthor.author_id)
+            .order_by(BookModel.id)
+        )
+        async with self._session_scope() as session:
+            result = await session.stream(stmt)
+            async for row in result:
+                yield row.id, row.title, row.name
+
+    async def stream_chunks(
+        self,
+        chunk_size: int,
+    ) -> AsyncIterator[list[BookModel]]:
+        """Yield every book ordered by id, ``chunk_size`` books at a time.
+
+        Rows come from a server-side cursor and authors are loaded per chunk,
+        so memory is bounded by the chunk size rather than the catalog size.
+        The authors' own ``books`` are not loaded: the export never reads
+        them and they would pull every book of every author in the chunk.
+        """
+        stmt = (
+            select(BookModel)
+            .options(selectinload(BookModel.authors).noload(AuthorModel.books))
+            .order_by(BookModel.id)
+            .execution_options(yield_per=chunk_size)
+        )
+        async with self._session_scope() as session:
+            result = await session.stream_scalars(stmt)
+            async for chunk in result.partitions():
+                yield list(chunk)
+
+    async def create_with_author_ids(
+        self,
+        data: dict[str, Any],
+        author_ids: Collection[int],
+    ) -> tuple[int, dt.datetime, dt.datetime]:
+        """Insert a book linked to ``author_ids``.
+
+        Returns the new ``(id, created_at, updated_at)``. On Postgres the
+        book and its links are written by one statement.
+        """
+        table = BookModel.__table__
+        returned = (table.c.id, table.c.created_at, table.c.updated_at)
+        async with self._session_scope() as session:
+            conn = await session.connection()
+            if conn.dialect.name == "postgresql":
+                new_book = (
+                    insert(table).values(**data).returning(*returned).cte("new_book")
+                )
+                links = (
+                    insert(BookAuthor)
+                    .from_select(
+                        ["book_id", "author_id"],
+                        select(
+                            new_book.c.id,
+                            func.unnest(
+                                literal(list(author_ids), ARRAY(Integer))
+                            ),
+                        ),
+                    )
+                    .cte("links")
+                )
+                result = await session.execute(select(new_book).add_cte(links))
+                return tuple(result.one())
+
+            statement = insert(table).values(**data).returning(*returned)
+            book = (await session.execute(statement)).one()
+            await session.execute(
+                insert(BookAuthor),
+                [
+                    {"book_id": book.id, "author_id": author_id}
+                    for author_id in author_ids
+                ],
+            )
+            return tuple(book)
+
+    async def bulk_insert(
+        self,
+        books: list[dict[str, Any]],
+        author_ids: list[list[int]],
+    ) -> list[int]:
+        """Insert books and their author links, returning the new book ids.
+
+        ``author_ids[i]`` holds the authors of ``books[i]``. Postgres writes
+        both tables with COPY on ids taken from the sequence in one query,
+        SQLite uses a multi-row INSERT ... RETURNING.
+        """
+        async with self._session_scope() as session:
+            conn = await session.connection()
+            if conn.dialect.name == "postgresql":
+                book_ids = list(
+                    await conn.scalars(
+                        select(
+                            func.nextval(
+                                func.pg_get_serial_sequence(
+                                    BookModel.__tablename__, "id"
+                                )
+                            )
+                        ).select_from(func.generate_series(1, len(books)))
+                    )
+                )
+                now = dt.datetime.now(dt.UTC)
+                raw = await conn.get_raw_connection()
+                await raw.driver_connection.copy_records_to_table(
+                    BookModel.__tablename__,
+                    columns=[
+                        "id",
+                        "title",
+                        "published_year",
+                        "genres",
+                        "genre_mask",
+                        "created_at",
+                        "updated_at",
+                    ],
+                    records=[
+                        (
+                            book_id,
+                            book["title"],
+                            book["published_year"],
+                            book["genres"],
+                            book["genre_mask"],
+                            now,
+                            now,
+                        )
+                        for book_id, book in zip(book_ids, books, strict=True)
+                    ],
+                )
+                await raw.driver_connection.copy_records_to_table(
+                    BookAuthor.__tablename__,
+                    columns=["book_id", "author_id"],
+                    records=[
+                        (book_id, author_id)
+                        for book_id, ids in zip(
+                            book_ids, author_ids, strict=True
+                        )
+                        for author_id in ids
+                    ],
+                )
+                return book_ids
+
+            # A multi-row INSERT hands out rowids in VALUES order.
+            result = await session.execute(
+                insert(BookModel).values(books).returning(BookModel.id)
+            )
+            book_ids = sorted(result.scalars())
+            links = [
+                {"book_id": book_id, "author_id": author_id}
+                for book_id, ids in zip(book_ids, author_ids, strict=True)
+                for author_id in ids
+            ]
+            if links:
+                await session.execute(insert(BookAuthor), links)
+            return book_ids
+
 
 class AuthorRepository(SQLAlchemyRepository):
     model = AuthorModel
+
+    async def stream_names(self) -> AsyncIterator[str]:
+        """Yield every author name for index building."""
+        async with self._session_scope() as session:
+            result = await session.stream_scalars(select(AuthorModel.name))
+            async for name in result:
+                yield name
+
+    async def get_ids_by_names(self, names: Collection[str]) -> dict[str, int]:
+        """Return a ``name -> id`` mapping of the existing authors."""
+        if not names:
+            return {}
+        async with self._session_scope() as session:
+            result = await session.execute(
+                select(AuthorModel.id, AuthorModel.name).where(
+                    AuthorModel.name.in_(list(names))
+                )
+            )
+            return {name: author_id for author_id, name in result}
+
+    async def upsert_names(self, names: Collection[str]) -> dict[str, int]:
+        """Create missing authors and return a ``name -> id`` mapping.
+
+        On Postgres the insert and the lookup of already existing authors
+        share a single statement. Both read the snapshot taken when it
+        started, so a name another transaction commits meanwhile is neither
+        inserted nor found; such names are looked up again afterwards.
+        """
+        if not names:
+            return {}
+        names = list(names)
+        rows = [{"name": name} for name in names]
+        table = AuthorModel.__table__
+        async with self._session_scope() as session:
+            conn = await session.connection()
+            if conn.dialect.name == "postgresql":
+                inserted = (
+                    pg_insert(table)
+                    .values(rows)
+                    .on_conflict_do_nothing(index_elements=["name"])
+                    .returning(table.c.id, table.c.name)
+                    .cte("inserted")
+                )
+                stmt = union_all(
+                    select(inserted.c.id, inserted.c.name),
+                    select(table.c.id, table.c.name).where(
+                        table.c.name.in_(names)
+                    ),
+                )
+            else:
+                await session.execute(
+                    sqlite_insert(table)
+                    .values(rows)
+                    .on_conflict_do_nothing(index_elements=["name"])
+                )
+                stmt = select(table.c.id, table.c.name).where(
+                    table.c.name.in_(names)
+                )
+            result = await session.execute(stmt)
+            author_ids = {name: author_id for author_id, name in result}
+            missing = [name for name in names if name not in author_ids]
+            if missing:
+                result = await session.execute(
+                    select(table.c.id, table.c.name).where(
+                        table.c.name.in_(missing)
+                    )
+                )
+                author_ids.update(
+                    {name: author_id for author_id, name in result}
+                )
+            return author_ids
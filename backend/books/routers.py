@@ -1,15 +1,52 @@
-import datetime as dt
-from typing import Annotated
+from typing import Annotated, Literal
 
 from auth.dependencies import PermissionDependency
+from base.conditional import (
+    is_not_modified,
+    not_modified,
+    page_validators,
+    validator_headers,
+)
 from base.dependencies import get_service
-from base.schema import DeleteResponse
-from core.settings import API_URL
-from fastapi import APIRouter, Depends, Query, status
+from base.responses import RenderedJSONResponse
+from base.schema import DeleteResponse, PageSchema
+from core.db import query_budget
+from core.settings import (
+    API_URL,
+    BOOK_BATCH_MAX_IDS,
+    FACETS_CACHE_TTL_SECONDS,
+    SUGGEST_LIMIT_MAX,
+)
+from fastapi import APIRouter, Depends, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
 
-from books.models import BookModel
+from books.exceptions import InvalidBatchIdsException
 from books.permissions import Is_Authenticated
-from books.schemas import AuthorSchema, BookBase, BookOutSchema
+from books.schemas import (
+    AuthorSchema,
+    BookBase,
+    BookBatchRequest,
+    BookBatchSchema,
+    BookFilterSchema,
+    BookOutSchema,
+    BookPageQuerySchema,
+    BookSearchHitSchema,
+    BookSearchQuerySchema,
+    BookSortKey,
+    BulkUploadResponse,
+    ExportFormat,
+    FacetsSchema,
+    Genre,
+    SearchMode,
+    SuggestionSchema,
+)
+from books.serializers import (
+    dump_batch,
+    dump_books,
+    dump_page,
+    dump_search_hits,
+    dump_suggestions,
+)
 from books.services import AuthorService, BookService
 
 book_router = APIRouter(
@@ -25,17 +62,92 @@ author_router = APIRouter(
 )
 
 
-@book_router.get("/all", response_model=list[BookOutSchema])
+def book_filters(
+    genres: Annotated[
+        list[Genre] | None, Query(description="Only books with these genres")
+    ] = None,
+    genres_match: Annotated[
+        Literal["any", "all"],
+        Query(description="Match any or all of the genres"),
+    ] = "any",
+    year_from: int | None = Query(None, description="Published in or after"),
+    year_to: int | None = Query(None, description="Published in or before"),
+) -> BookFilterSchema:
+    """Collect the genre and year filters from the query string."""
+    return BookFilterSchema(
+        genres=genres or [],
+        genres_match=genres_match,
+        year_from=year_from,
+        year_to=year_to,
+    )
+
+
+def book_page(
+    cursor: str | None = Query(
+        None, description="next_cursor of the previous page"
+    ),
+    limit: int = Query(20, ge=1, le=100),
+    sort: BookSortKey = "created_at",
+    order: Literal["asc", "desc"] = "desc",
+) -> BookPageQuerySchema:
+    """Collect the cursor, page size and ordering of /all."""
+    return BookPageQuerySchema(
+        cursor=cursor, limit=limit, sort=sort, order=order
+    )
+
+
+def book_search(
+    query: str = Query(
+        ..., min_length=1, description="Title or author to search"
+    ),
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    mode: Annotated[
+        SearchMode,
+        Query(
+            description=(
+                "fuzzy: typo tolerant; "
+                "fulltext: ranked keywords with highlights"
+            ),
+        ),
+    ] = "fuzzy",
+) -> BookSearchQuerySchema:
+    """Collect the search text, mode and result window of /search."""
+    return BookSearchQuerySchema(
+        query=query, limit=limit, offset=offset, mode=mode
+    )
+
+
+@book_router.get(
+    "/all",
+    response_model=PageSchema[BookOutSchema],
+    dependencies=[Depends(query_budget(3))],
+)
 async def get_all_books(
+    request: Request,
     service: Annotated[BookService, Depends(get_service(BookService))],
-    created_at: dt.datetime | None = None,
-    last_id: int | None = None,
-    limit: int | None = None,
-) -> list[BookOutSchema] | None:
-    """Retrieve a list of all available book with optional filtering.
+    filters: Annotated[BookFilterSchema, Depends(book_filters)],
+    page: Annotated[BookPageQuerySchema, Depends(book_page)],
+) -> Response:
+    """Retrieve a page of books ordered by the chosen sort key.
+    Pass the returned next_cursor back to get the following page.
+    Answers 304 when the page has not changed since the client's ETag.
     """
-    books: list[BookModel] = await service.get_all_books(created_at, last_id, limit)
-    return [BookOutSchema.model_validate(c) for c in books]
+    books, next_cursor = await service.get_all_books(
+        limit=page.limit,
+        cursor=page.cursor,
+        sort_by=page.sort,
+        descending=page.order == "desc",
+        filters=filters,
+    )
+    body = dump_page(books, next_cursor)
+    etag, last_modified = page_validators(books, body)
+    if is_not_modified(request, etag, last_modified):
+        return not_modified(etag, last_modified)
+    return RenderedJSONResponse(
+        body,
+        headers=validator_headers(etag, last_modified),
+    )
 
 
 @book_router.post(
@@ -46,33 +158,180 @@ async def create_book(
     service: Annotated[BookService, Depends(get_service(BookService))],
 ) -> BookOutSchema:
     """Endpoint to create a new book."""
-    book = await service.create_book(book_schema=book_schema)
+    return await service.create_book(book_schema=book_schema)
 
-    return BookOutSchema.model_validate(book)
 
+@book_router.post(
+    "/bulk-upload",
+    response_model=BulkUploadResponse,
+    status_code=status.HTTP_201_CREATED,
+)
+async def bulk_upload_books(
+    request: Request,
+    service: Annotated[BookService, Depends(get_service(BookService))],
+) -> BulkUploadResponse:
+    """Upload books from a JSON array streamed in the request body.
+    Example: [{"title": "...", "authors": ["..."], "genres": ["Fiction"],
+    "published_year": 1997}, ...]
+    """
+    inserted = await service.bulk_upload(request.stream())
+    return BulkUploadResponse(inserted=inserted)
 
-@book_router.get("/{book_id}", response_model=BookOutSchema)
-async def get_book(
-    book_id: int,
+
+@book_router.get("/facets", response_model=FacetsSchema)
+async def get_facets(
+    response: Response,
+    filters: Annotated[BookFilterSchema, Depends(book_filters)],
     service: Annotated[BookService, Depends(get_service(BookService))],
-) -> BookOutSchema:
-    """Endpoint to get a book by its ID."""
-    book = await service.get_book(book_id)
-    return BookOutSchema.model_validate(book)
+) -> FacetsSchema:
+    """Count books per genre and per decade, honouring the same filters
+    as /all.
+    """
+    response.headers["Cache-Control"] = (
+        f"private, max-age={int(FACETS_CACHE_TTL_SECONDS)}"
+    )
+    return await service.get_facets(filters)
+
+
+_EXPORT_MEDIA_TYPES: dict[str, str] = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+
+
+@book_router.get("/export", response_class=StreamingResponse)
+async def export_books(
+    export_format: Annotated[ExportFormat, Query(alias="format")] = "ndjson",
+) -> StreamingResponse:
+    """Stream the whole catalog as NDJSON (one book per line) or CSV.
+    Memory use does not grow with the catalog size.
+    """
+    return StreamingResponse(
+        BookService.export_books(export_format),
+        media_type=_EXPORT_MEDIA_TYPES[export_format],
+        headers={
+            "Content-Disposition": (
+                f'attachment; filename="books.{export_format}"'
+            ),
+        },
+    )
 
 
-@book_router.get("/search", response_model=list[BookOutSchema])
+def parse_batch_ids(
+    ids: str = Query(..., description="Comma separated book ids, e.g. 1,5,42"),
+) -> list[int]:
+    """Parse the ids query parameter of the batch endpoint."""
+    try:
+        parsed = [int(part) for part in ids.split(",") if part.strip()]
+    except ValueError:
+        raise InvalidBatchIdsException(BOOK_BATCH_MAX_IDS) from None
+    if not 0 < len(parsed) <= BOOK_BATCH_MAX_IDS:
+        raise InvalidBatchIdsException(BOOK_BATCH_MAX_IDS)
+    return parsed
+
+
+@book_router.get(
+    "/batch",
+    response_model=BookBatchSchema,
+    dependencies=[Depends(query_budget(3))],
+)
+async def get_books_batch(
+    ids: Annotated[list[int], Depends(parse_batch_ids)],
+    service: Annotated[BookService, Depends(get_service(BookService))],
+) -> Response:
+    """Fetch several books at once, in the order of ``ids``.
+    Ids without a book are listed in ``missing``.
+    """
+    books, missing = await service.get_books_batch(ids)
+    return RenderedJSONResponse(dump_batch(books, missing))
+
+
+@book_router.post(
+    "/batch",
+    response_model=BookBatchSchema,
+    dependencies=[Depends(query_budget(3))],
+)
+async def post_books_batch(
+    batch: BookBatchRequest,
+    service: Annotated[BookService, Depends(get_service(BookService))],
+) -> Response:
+    """Fetch a batch like GET /batch, for id lists too long for a URL."""
+    books, missing = await service.get_books_batch(batch.ids)
+    return RenderedJSONResponse(dump_batch(books, missing))
+
+
+@book_router.get(
+    "/search",
+    response_model=list[BookOutSchema] | list[BookSearchHitSchema],
+    dependencies=[Depends(query_budget(4))],
+)
 async def search_books(
-    query: str = Query(..., min_length=1, description="Title or author to search"),
-    limit: int = Query(20, ge=1, le=100),
-    offset: int = Query(0, ge=0),
-    service: Annotated[BookService, Depends(get_service(BookService))] = None,
-) -> list[BookOutSchema]:
+    filters: Annotated[BookFilterSchema, Depends(book_filters)],
+    search: Annotated[BookSearchQuerySchema, Depends(book_search)],
+    service: Annotated[BookService, Depends(get_service(BookService))],
+) -> Response:
     """Case-insensitive + fuzzy search by title or author.
     Example: query='Harry Potter' → finds 'Harry Potter and the Sorcerer’s Stone'.
+    With mode=fulltext every word is matched against titles, author names and
+    genres, results are ranked and carry a highlighted ``headline``.
+    """
+    if search.mode == "fulltext":
+        hits = await service.full_text_search_books(
+            query=search.query,
+            limit=search.limit,
+            offset=search.offset,
+            filters=filters,
+        )
+        return RenderedJSONResponse(dump_search_hits(hits))
+    results = await service.search_books(
+        query=search.query,
+        limit=search.limit,
+        offset=search.offset,
+        filters=filters,
+    )
+    return RenderedJSONResponse(dump_books(results))
+
+
+@book_router.get(
+    "/suggest",
+    response_model=list[SuggestionSchema],
+    dependencies=[Depends(query_budget(1))],
+)
+async def suggest_books(
+    service: Annotated[BookService, Depends(get_service(BookService))],
+    prefix: str = Query(
+        ..., min_length=1, description="What the user typed so far"
+    ),
+    limit: int = Query(10, ge=1, le=SUGGEST_LIMIT_MAX),
+) -> Response:
+    """Typeahead completions: titles and author names with a word starting
+    with ``prefix``, most popular first. Served from memory, without
+    touching the database.
+    """
+    suggestions = service.suggest(prefix, limit)
+    return RenderedJSONResponse(dump_suggestions(suggestions))
+
+
+@book_router.get(
+    "/{book_id}",
+    response_model=BookOutSchema,
+    dependencies=[Depends(query_budget(3))],
+)
+async def get_book(
+    book_id: int,
+    request: Request,
+    service: Annotated[BookService, Depends(get_service(BookService))],
+) -> Response:
+    """Endpoint to get a book by its ID, served from the book cache.
+    Answers 304 when If-None-Match/If-Modified-Since still match.
     """
-    results = await service.search_books(query=query, limit=limit, offset=offset)
-    return [BookOutSchema.model_validate(b) for b in results]
+    book = await service.get_book_json(book_id)
+    if is_not_modified(request, book.etag, book.last_modified):
+        return not_modified(book.etag, book.last_modified)
+    return RenderedJSONResponse(
+        book.payload,
+        headers=validator_headers(book.etag, book.last_modified),
+    )
 
 
 @book_router.patch("/{book_id}", response_model=BookOutSchema)
@@ -4,18 +4,40 @@ from datetime import datetime
 from typing import Literal
 
 from base.schema import BaseSchema
-from core.settings import ALLOWED_GENRES
-from pydantic import Field, field_serializer, field_validator
+from core.settings import ALLOWED_GENRES, BOOK_BATCH_MAX_IDS
+from pydantic import (
+    AliasChoices,
+    Field,
+    computed_field,
+    field_serializer,
+    field_validator,
+)
 
+from books.genres import genres_to_mask
 from books.validators import clean_date, clean_empty_values
 
+BookSortKey = Literal["created_at", "published_year", "title"]
+ExportFormat = Literal["ndjson", "csv"]
+SearchMode = Literal["fuzzy", "fulltext"]
+SuggestionKind = Literal["title", "author"]
+Genre = Literal[*ALLOWED_GENRES]
+
 
 class BookBase(BaseSchema):
     title: str = Field(min_length=1, max_length=255)
-    author_names: list[str] = Field(default_factory=list)
-    genres: list[Literal[*ALLOWED_GENRES]] = Field(min_length=1)
+    author_names: list[str] = Field(
+        default_factory=list,
+        validation_alias=AliasChoices("author_names", "authors"),
+    )
+    genres: list[Genre] = Field(min_length=1)
     published_year: int
 
+    @computed_field
+    @property
+    def genre_mask(self) -> int:
+        """Genres as stored in ``books.genre_mask``."""
+        return genres_to_mask(self.genres)
+
     @field_validator("title")
     @classmethod
     def title_not_blank(cls, v: str) -> str:
@@ -47,5 +69,71 @@ class BookOutSchema(BaseSchema):
         return [a.name for a in authors]
 
 
+class BookSearchHitSchema(BookOutSchema):
+    """A full-text search result with its relevance and highlighted text."""
+
+    rank: float | None = None
+    headline: str
+
+
 class AuthorSchema(BaseSchema):
     name: str
+
+
+class SuggestionSchema(BaseSchema):
+    """A title or author name completing the typed prefix."""
+
+    text: str
+    kind: SuggestionKind
+    popularity: int
+
+
+class BookFilterSchema(BaseSchema):
+    """Query filters shared by the list, search and facet endpoints."""
+
+    genres: list[Genre] = Field(
+        default_factory=list,
+        description="Only books tagged with these genres",
+    )
+    genres_match: Literal["any", "all"] = Field(
+        "any",
+        description="Whether a book needs any or all of the genres",
+    )
+    year_from: int | None = Field(None, description="Published in or after")
+    year_to: int | None = Field(None, description="Published in or before")
+
+
+class BookPageQuerySchema(BaseSchema):
+    """Cursor, size and ordering of one /all page."""
+
+    cursor: str | None = None
+    limit: int = Field(20, ge=1, le=100)
+    sort: BookSortKey = "created_at"
+    order: Literal["asc", "desc"] = "desc"
+
+
+class BookSearchQuerySchema(BaseSchema):
+    """Search text, mode and window of one /search request."""
+
+    query: str = Field(min_length=1)
+    limit: int = Field(20, ge=1, le=100)
+    offset: int = Field(0, ge=0)
+    mode: SearchMode = "fuzzy"
+
+
+class FacetsSchema(BaseSchema):
+    genres: dict[str, int]
+    decades: dict[int, int]
+
+
+class BookBatchRequest(BaseSchema):
+    ids: list[int] = Field(min_length=1, max_length=BOOK_BATCH_MAX_IDS)
+
+
+class BookBatchSchema(BaseSchema):
+    items: list[BookOutSchema]
+    missing: list[int]
+
+
+class BulkUploadResponse(BaseSchema):
+    inserted: int
@@ -0,0 +1,140 @@
+"""In-process trigram index used for search in DEBUG mode."""
+
+import math
+import re
+from collections.abc import Iterable
+
+from core.settings import SEARCH_WORD_SIMILARITY_THRESHOLD
+
+from books.repository import BookRepository
+
+_WORD_RE = re.compile(r"\w+")
+
+
+def trigrams(text: str) -> set[str]:
+    """Split text into pg_trgm compatible trigrams.
+
+    Every alphanumeric word is lower-cased and padded with two leading and
+    one trailing space, the way ``show_trgm`` does it in Postgres.
+    """
+    grams: set[str] = set()
+    for word in _WORD_RE.findall(text.lower()):
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+class TrigramIndex:
+    """In-process inverted trigram index used when Postgres is not available.
+
+    Each document is a book id with its title and author names. A query
+    matches a document when at least ``threshold`` of the query trigrams are
+    present in it, which mirrors the ``<%`` word similarity operator.
+    """
+
+    def __init__(
+        self,
+        threshold: float = SEARCH_WORD_SIMILARITY_THRESHOLD,
+    ) -> None:
+        """Match words at least ``threshold`` similar, like ``<%``."""
+        self.threshold = threshold
+        self._postings: dict[str, set[int]] = {}
+        self._documents: dict[int, frozenset[str]] = {}
+
+    def __len__(self) -> int:
+        """Return the number of indexed documents."""
+        return len(self._documents)
+
+    def add(self, doc_id: int, texts: Iterable[str]) -> None:
+        """Index a document, replacing any previous version of it."""
+        self.remove(doc_id)
+        grams: set[str] = set()
+        for text in texts:
+            grams |= trigrams(text)
+        for gram in grams:
+            self._postings.setdefault(gram, set()).add(doc_id)
+        self._documents[doc_id] = frozenset(grams)
+
+    def remove(self, doc_id: int) -> None:
+        """Drop a document from the index if it is present."""
+        grams = self._documents.pop(doc_id, None)
+        if not grams:
+            return
+        for gram in grams:
+            posting = self._postings.get(gram)
+            if posting is None:
+                continue
+            posting.discard(doc_id)
+            if not posting:
+                del self._postings[gram]
+
+    def clear(self) -> None:
+        """Remove every document from the index."""
+        self._postings.clear()
+        self._documents.clear()
+
+    def search(
+        self,
+        query: str,
+        limit: int | None,
+        offset: int = 0,
+    ) -> list[int]:
+        """Return ids of matching documents ordered by similarity.
+
+        Only the rarest posting lists are scanned to collect candidates: a
+        document missing all of them cannot reach the threshold anyway.
+        ``limit=None`` returns every match.
+        """
+        grams = trigrams(query)
+        if not grams:
+            return []
+        required = max(1, math.ceil(len(grams) * self.threshold))
+        postings = sorted(
+            (self._postings.get(gram, set()) for gram in grams),
+            key=len,
+        )
+        candidates: set[int] = set().union(
+            *postings[:len(grams) - required + 1],
+        )
+
+        scored: list[tuple[float, int]] = []
+        for doc_id in candidates:
+            hits = sum(doc_id in posting for posting in postings)
+            if hits >= required:
+                scored.append((hits / len(grams), doc_id))
+        scored.sort(key=lambda item: (-item[0], item[1]))
+        stop = None if limit is None else offset + limit
+        return [doc_id for _, doc_id in scored[offset:stop]]
+
+
+def highlight(text: str, query: str) -> str:
+    """Wrap the words of ``text`` that occur in ``query`` in ``<mark>``.
+
+    A plain word match standing in for ``ts_headline`` in DEBUG mode.
+    """
+    words = {word.lower() for word in _WORD_RE.findall(query)}
+    return _WORD_RE.sub(
+        lambda m: f"<mark>{m[0]}</mark>" if m[0].lower() in words else m[0],
+        text,
+    )
+
+
+book_search_index = TrigramIndex()
+
+
+async def build_book_search_index() -> None:
+    """Load every book with its author names into ``book_search_index``."""
+    book_search_index.clear()
+    current_id: int | None = None
+    texts: list[str] = []
+    async for book_id, title, author_name in (
+        BookRepository().stream_search_documents()
+    ):
+        if book_id != current_id:
+            if current_id is not None:
+                book_search_index.add(current_id, texts)
+            current_id, texts = book_id, [title]
+        if author_name:
+            texts.append(author_name)
+    if current_id is not None:
+        book_search_index.add(current_id, texts)
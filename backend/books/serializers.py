@@ -0,0 +1,110 @@
+"""Render books straight to JSON and CSV bytes, without pydantic models."""
+
+import csv
+import io
+from collections.abc import Iterable
+from typing import Any
+
+from pydantic_core import to_json
+
+
+def book_json_obj(book: Any) -> dict[str, Any]:
+    """Map a ``BookModel``, or a ``Row`` like it, onto ``BookOutSchema``.
+
+    ``authors`` may hold ``AuthorModel`` objects or plain names.
+    """
+    return {
+        "id": book.id,
+        "title": book.title,
+        "authors": [
+            author if isinstance(author, str) else author.name
+            for author in book.authors
+        ],
+        "genres": book.genres,
+        "published_year": book.published_year,
+        "created_at": book.created_at,
+        "updated_at": book.updated_at,
+    }
+
+
+def dump_book(book: Any) -> bytes:
+    """Render one book as ``BookOutSchema`` JSON."""
+    return to_json(book_json_obj(book))
+
+
+def dump_books(books: Iterable[Any]) -> bytes:
+    """Render books as a ``list[BookOutSchema]`` JSON array in one pass."""
+    return to_json([book_json_obj(book) for book in books])
+
+
+def dump_page(books: Iterable[Any], next_cursor: str | None) -> bytes:
+    """Render books as ``PageSchema[BookOutSchema]`` JSON in one pass."""
+    return to_json(
+        {
+            "items": [book_json_obj(book) for book in books],
+            "next_cursor": next_cursor,
+        }
+    )
+
+
+def dump_batch(books: Iterable[Any], missing: list[int]) -> bytes:
+    """Render a ``BookBatchSchema`` response in one pass."""
+    return to_json(
+        {
+            "items": [book_json_obj(book) for book in books],
+            "missing": missing,
+        }
+    )
+
+
+def dump_search_hits(hits: Iterable[tuple[Any, float | None, str]]) -> bytes:
+    """Render ``(book, rank, headline)`` rows as ``BookSearchHitSchema``s."""
+    return to_json(
+        [
+            {**book_json_obj(book), "rank": rank, "headline": headline}
+            for book, rank, headline in hits
+        ]
+    )
+
+
+def dump_suggestions(suggestions: Iterable[Any]) -> bytes:
+    """Render ``Suggestion`` tuples as ``list[SuggestionSchema]`` JSON."""
+    return to_json([suggestion._asdict() for suggestion in suggestions])
+
+
+CSV_COLUMNS = (
+    "id",
+    "title",
+    "authors",
+    "genres",
+    "published_year",
+    "created_at",
+    "updated_at",
+)
+
+
+def dump_ndjson(books: Iterable[Any]) -> bytes:
+    """Render books as newline delimited ``BookOutSchema`` JSON."""
+    return b"".join(to_json(book_json_obj(book)) + b"\n" for book in books)
+
+
+def dump_csv(books: Iterable[Any], *, header: bool = False) -> bytes:
+    """Render books as CSV rows; authors and genres are joined by "; "."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if header:
+        writer.writerow(CSV_COLUMNS)
+    for book in books:
+        row = book_json_obj(book)
+        writer.writerow(
+            [
+                row["id"],
+                row["title"],
+                "; ".join(row["authors"]),
+                "; ".join(row["genres"]),
+                row["published_year"],
+                row["created_at"].isoformat(),
+                row["updated_at"].isoformat(),
+            ]
+        )
+    return buffer.getvalue().encode()
@@ -1,13 +1,92 @@
 import datetime as dt
+import itertools
+from collections.abc import AsyncIterable, AsyncIterator, Iterable
+from typing import Any
 
 from base.abstract import AbstractRepository
+from base.conditional import make_etag
 from base.services import BaseService
+from core.settings import BOOK_EXPORT_CHUNK_SIZE, BULK_UPLOAD_CHUNK_SIZE, DEBUG
+from pydantic import TypeAdapter, ValidationError
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio.session import AsyncSession
 
-from books.exceptions import AuthorNotExistException, BookNotFoundByIdException
+from books.bulk import batched, iter_json_array
+from books.cache import CachedBook, author_ids_cache, book_cache, facets_cache
+from books.exceptions import (
+    AuthorNotExistException,
+    BookNotFoundByIdException,
+    BulkUploadException,
+)
 from books.models import AuthorModel, BookModel
 from books.repository import AuthorRepository, BookRepository
-from books.schemas import AuthorSchema, BookBase
+from books.schemas import (
+    AuthorSchema,
+    BookBase,
+    BookFilterSchema,
+    BookOutSchema,
+    BookSortKey,
+    ExportFormat,
+    FacetsSchema,
+)
+from books.search import book_search_index, highlight
+from books.serializers import dump_book, dump_csv, dump_ndjson
+from books.suggest import Suggestion, suggest_index
+
+_book_rows_adapter = TypeAdapter(list[BookBase])
+# Ranked ids checked against the filters per query in DEBUG search.
+_SEARCH_FILTER_CHUNK_SIZE = 500
+
+
+class AuthorResolver:
+    """Resolve author names to ids through the shared name -> id cache.
+
+    Misses are looked up with one ids-only query and, when asked to, created
+    with ``INSERT ... ON CONFLICT DO NOTHING``. Ids learnt inside the request
+    transaction are only published to the cache by ``publish`` after commit,
+    so a rollback cannot leave ids of authors that never existed behind.
+    """
+
+    def __init__(self, repo: AuthorRepository) -> None:
+        """Resolve names through ``repo`` and the shared author id cache."""
+        self.repo = repo
+        self._pending: dict[str, int] = {}
+
+    async def resolve(
+        self,
+        names: Iterable[str],
+        *,
+        create_missing: bool = False,
+    ) -> dict[str, int]:
+        """Return ids of ``names``; unknown ones are left out unless created."""
+        resolved: dict[str, int] = {}
+        missing: list[str] = []
+        for name in dict.fromkeys(names):
+            author_id = self._pending.get(name) or author_ids_cache.get(name)
+            if author_id is None:
+                missing.append(name)
+            else:
+                resolved[name] = author_id
+        if missing:
+            if create_missing:
+                found = await self.repo.upsert_names(missing)
+            else:
+                found = await self.repo.get_ids_by_names(missing)
+            self._pending.update(found)
+            resolved.update(found)
+        return resolved
+
+    def publish(self) -> None:
+        """Cache the ids resolved since the last commit."""
+        for name, author_id in self._pending.items():
+            author_ids_cache.set(name, author_id)
+        self._pending.clear()
+
+    def forget(self, names: Iterable[str]) -> None:
+        """Drop cached ids of ``names`` so the next resolve reads them anew."""
+        for name in names:
+            self._pending.pop(name, None)
+            author_ids_cache.pop(name)
 
 
 class BookService(BaseService):
@@ -15,46 +94,260 @@ class BookService(BaseService):
 
     def __init__(self, db_session: AsyncSession, repo: AbstractRepository = None):
         super().__init__(db_session)
-        self.repo = repo or BookRepository()
-        self.author_repo = AuthorRepository()
+        self.repo = repo or BookRepository(db_session)
+        self.author_repo = AuthorRepository(db_session)
+        self.authors = AuthorResolver(self.author_repo)
 
-    async def create_book(self, book_schema: BookBase) -> BookModel:
-        """Create a new book in the database."""
-        book_data = book_schema.model_dump()
-        authors: list[AuthorModel] = await self.fetch_author(book_data["author_names"])
-        del book_data["author_names"]
-        book: BookModel = await self.repo.create_one(book_data, True)
-        book: BookModel = await self.repo.add_many_to_many(book, "authors", authors)
+    async def commit(self) -> None:
+        """Commit the unit of work, then cache the author ids it resolved."""
+        await super().commit()
+        self.authors.publish()
+
+    async def create_book(self, book_schema: BookBase) -> BookOutSchema:
+        """Create a new book linked to its existing authors.
+
+        Author ids come from the name -> id cache; the book and its links are
+        written with set-based statements and the response is built from the
+        returned row instead of a reload. A cached id can outlive its author:
+        when the links then violate their foreign key, the names are looked
+        up again in the database and the insert is retried once.
+        """
+        names = list(dict.fromkeys(book_schema.author_names))
+        book_data = book_schema.model_dump(exclude={"author_names"})
+        try:
+            book_id, created_at, updated_at = await self._insert_book(
+                book_data, names
+            )
+        except IntegrityError:
+            await self.session.rollback()
+            self.authors.forget(names)
+            book_id, created_at, updated_at = await self._insert_book(
+                book_data, names
+            )
+        await self.commit()
+        facets_cache.clear()
+
+        book = BookOutSchema(
+            id=book_id,
+            authors=[AuthorSchema(name=name) for name in names],
+            created_at=created_at,
+            updated_at=updated_at,
+            **book_data,
+        )
+        self._index_book(book)
         return book
 
+    async def _insert_book(
+        self,
+        book_data: dict[str, Any],
+        names: list[str],
+    ) -> tuple[int, dt.datetime, dt.datetime]:
+        """Resolve the author names and insert the book with its links."""
+        author_ids = await self.authors.resolve(names)
+        if len(author_ids) != len(names):
+            raise AuthorNotExistException()
+        return await self.repo.create_with_author_ids(
+            book_data, [author_ids[name] for name in names]
+        )
+
+    @staticmethod
+    def _index_book(book: BookModel | BookOutSchema) -> None:
+        """Index a committed book for suggestions, and search in DEBUG."""
+        names = [author.name for author in book.authors]
+        suggest_index.add_book(book.id, book.title, names)
+        if DEBUG:
+            book_search_index.add(book.id, [book.title, *names])
+
+    async def bulk_upload(self, body: AsyncIterable[bytes]) -> int:
+        """Stream a JSON array of books into the database.
+
+        Rows are validated and written chunk by chunk; missing authors are
+        created. The whole upload is committed as one unit of work.
+        """
+        inserted: list[tuple[int, BookBase]] = []
+        try:
+            async for rows in batched(
+                iter_json_array(body), BULK_UPLOAD_CHUNK_SIZE
+            ):
+                inserted.extend(await self._insert_chunk(rows))
+            await self.commit()
+            facets_cache.clear()
+        except BaseException:
+            if DEBUG:
+                for book_id, _ in inserted:
+                    book_search_index.remove(book_id)
+            raise
+        with suggest_index.loading():
+            for book_id, book in inserted:
+                suggest_index.add_book(book_id, book.title, book.author_names)
+        return len(inserted)
+
+    async def _insert_chunk(
+        self,
+        rows: list[dict[str, Any]],
+    ) -> list[tuple[int, BookBase]]:
+        """Validate one chunk of uploaded rows and insert it."""
+        try:
+            books: list[BookBase] = _book_rows_adapter.validate_python(rows)
+        except ValidationError:
+            raise BulkUploadException from None
+
+        author_ids = await self.authors.resolve(
+            (name for book in books for name in book.author_names),
+            create_missing=True,
+        )
+        book_ids = await self.repo.bulk_insert(
+            [book.model_dump(exclude={"author_names"}) for book in books],
+            [
+                list(dict.fromkeys(author_ids[n] for n in book.author_names))
+                for book in books
+            ],
+        )
+        inserted = list(zip(book_ids, books, strict=True))
+        if DEBUG:
+            for book_id, book in inserted:
+                book_search_index.add(book_id, [book.title, *book.author_names])
+        return inserted
+
     async def get_all_books(
         self,
-        created_at: dt.datetime | None = None,
-        last_id: int | None = None,
-        limit: int | None = None,
-    ) -> list[BookModel]:
-        """Retrieve a list of all active book from the database.
+        limit: int,
+        cursor: str | None = None,
+        sort_by: BookSortKey = "created_at",
+        *,
+        descending: bool = True,
+        filters: BookFilterSchema | None = None,
+    ) -> tuple[list[BookModel], str | None]:
+        """Retrieve one keyset page of books and the cursor of the next one.
         """
-        async with self.session.begin():
-            books: list[BookModel] | None = await self.repo.get_all(
-                created_at=created_at,
-                last_id=last_id,
-                limit=limit,
-            )
-        return books if books else []
+        return await self.repo.get_page(
+            sort_by=sort_by,
+            limit=limit,
+            cursor=cursor,
+            descending=descending,
+            filters=self._filter_clauses(filters),
+        )
 
-    async def fetch_author(self, author_names: list) -> list[AuthorModel]:
-        """Fetch author data for books."""
-        authors = await self.author_repo.get_ids_by_lst(author_names)
-        if not authors:
-            raise AuthorNotExistException()
-        return authors
+    def _filter_clauses(self, filters: BookFilterSchema | None) -> list[Any]:
+        """Translate the genre and year filters into repository clauses."""
+        if filters is None:
+            return []
+        return self.repo.filter_clauses(**filters.model_dump())
+
+    async def get_facets(self, filters: BookFilterSchema) -> FacetsSchema:
+        """Count books per genre and decade, cached per filter set."""
+        key = filters.model_dump_json()
+        counts = facets_cache.get(key)
+        if counts is None:
+            counts = await self.repo.facets(self._filter_clauses(filters))
+            facets_cache.set(key, counts)
+        genres, decades = counts
+        return FacetsSchema(genres=genres, decades=decades)
+
+    @staticmethod
+    async def export_books(
+        export_format: ExportFormat,
+        chunk_size: int = BOOK_EXPORT_CHUNK_SIZE,
+    ) -> AsyncIterator[bytes]:
+        """Stream the whole catalog as NDJSON or CSV, one chunk at a time.
+
+        The body is sent after the request session is closed, so the export
+        runs on its own standalone repository session.
+        """
+        header = export_format == "csv"
+        async for books in BookRepository().stream_chunks(chunk_size):
+            if export_format == "csv":
+                yield dump_csv(books, header=header)
+                header = False
+            else:
+                yield dump_ndjson(books)
+        if header:
+            yield dump_csv([], header=True)
+
+    async def get_books_batch(
+        self,
+        ids: list[int],
+    ) -> tuple[list[BookModel], list[int]]:
+        """Fetch many books with one query, in request order.
+
+        Duplicate ids are returned once; ids with no book are reported back.
+        """
+        ids = list(dict.fromkeys(ids))
+        books = await self.repo.get_by_ids(ids)
+        found = {book.id for book in books}
+        return books, [book_id for book_id in ids if book_id not in found]
 
     async def search_books(
-        self, query: str, limit: int, offset: int
+        self,
+        query: str,
+        limit: int,
+        offset: int,
+        filters: BookFilterSchema | None = None,
     ) -> list[BookModel]:
-        """Search for books matching the query."""
-        return await self.repo.get_all(query=query, limit=limit, offset=offset)
+        """Search for books matching the query.
+
+        Postgres ranks matches with pg_trgm, SQLite in DEBUG mode falls back
+        to the in-process trigram index. Filtered DEBUG searches check the
+        ranked ids against the filters chunk by chunk, stopping once the
+        requested page is complete, and only load the books of that page.
+        """
+        clauses = self._filter_clauses(filters)
+        if DEBUG:
+            if not clauses:
+                book_ids = book_search_index.search(
+                    query, limit=limit, offset=offset
+                )
+                return await self.repo.get_by_ids(book_ids)
+            wanted = offset + limit
+            matched: list[int] = []
+            for chunk in itertools.batched(
+                book_search_index.search(query, limit=None),
+                _SEARCH_FILTER_CHUNK_SIZE,
+                strict=False,
+            ):
+                matched += await self.repo.filter_ids(list(chunk), clauses)
+                if len(matched) >= wanted:
+                    break
+            return await self.repo.get_by_ids(matched[offset:wanted])
+        return await self.repo.search(
+            query, limit=limit, offset=offset, filters=clauses
+        )
+
+    async def full_text_search_books(
+        self,
+        query: str,
+        limit: int,
+        offset: int,
+        filters: BookFilterSchema | None = None,
+    ) -> list[tuple[BookModel, float | None, str]]:
+        """Relevance ranked keyword search with highlighted matches.
+
+        Postgres matches ``books.search_vector``; SQLite in DEBUG mode falls
+        back to the trigram index, unranked and with naive highlighting.
+        """
+        if DEBUG:
+            books = await self.search_books(query, limit, offset, filters)
+            return [
+                (book, None, highlight(self._headline_text(book), query))
+                for book in books
+            ]
+        return await self.repo.full_text_search(
+            query,
+            limit=limit,
+            offset=offset,
+            filters=self._filter_clauses(filters),
+        )
+
+    @staticmethod
+    def suggest(prefix: str, limit: int) -> list[Suggestion]:
+        """Complete a typed prefix from the in-memory suggest index."""
+        return suggest_index.suggest(prefix, limit)
+
+    @staticmethod
+    def _headline_text(book: BookModel) -> str:
+        """Title and author names, as ``ts_headline`` sees them on Postgres."""
+        names = ", ".join(author.name for author in book.authors)
+        return f"{book.title} — {names}" if names else book.title
 
     async def get_book(
         self,
@@ -69,6 +362,26 @@ class BookService(BaseService):
             raise BookNotFoundByIdException
         return book
 
+    async def get_book_json(self, book_id: int) -> CachedBook:
+        """Return the serialized book, read through the book cache.
+
+        The ETag is a digest of the payload rather than of ``updated_at``,
+        which only has second precision on SQLite.
+        """
+        cached = await book_cache.get(book_id)
+        if cached is not None:
+            return cached
+        generation = book_cache.generation
+        book = await self.get_book(book_id)
+        payload = dump_book(book)
+        cached = CachedBook(
+            payload=payload,
+            etag=make_etag((book.id, payload)),
+            last_modified=book.updated_at,
+        )
+        await book_cache.set(book_id, cached, generation)
+        return cached
+
     async def update_book(
         self,
         book_id: int,
@@ -86,6 +399,10 @@ class BookService(BaseService):
         )
         if not updated_book:
             raise BookNotFoundByIdException
+        await self.commit()
+        await book_cache.invalidate(book_id)
+        facets_cache.clear()
+        self._index_book(updated_book)
         return updated_book
 
     async def delete_book(
@@ -94,11 +411,17 @@ class BookService(BaseService):
     ) -> None:
         """Delete a book in the database.
         """
-        deleted_book: BookModel | None = await self.repo.delete(
+        deleted_count: int = await self.repo.delete(
             id=book_id,
         )
-        if deleted_book:
+        if not deleted_count:
             raise BookNotFoundByIdException
+        await self.commit()
+        await book_cache.invalidate(book_id)
+        facets_cache.clear()
+        suggest_index.remove_book(book_id)
+        if DEBUG:
+            book_search_index.remove(book_id)
 
 
 class AuthorService(BaseService):
@@ -106,10 +429,13 @@ class AuthorService(BaseService):
 
     def __init__(self, db_session: AsyncSession, repo: AbstractRepository = None):
         super().__init__(db_session)
-        self.repo = AuthorRepository()
+        self.repo = repo or AuthorRepository(db_session)
 
     async def create_author(self, author_schema: AuthorSchema) -> AuthorModel:
         """Create a new book in the database."""
         author_data = author_schema.model_dump()
         author: AuthorModel = await self.repo.create_one(author_data)
+        await self.commit()
+        author_ids_cache.set(author.name, author.id)
+        suggest_index.add_author(author.name)
         return author
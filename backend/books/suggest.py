@@ -0,0 +1,356 @@
+"""In-process prefix index behind /books/suggest."""
+
+import heapq
+import re
+import sys
+import unicodedata
+from bisect import bisect_left, insort
+from collections import defaultdict
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from typing import NamedTuple
+
+from core.metrics import register_index
+from core.settings import SUGGEST_LIMIT_MAX
+
+from books.repository import AuthorRepository, BookRepository
+from books.schemas import SuggestionKind
+
+_SPACES_RE = re.compile(r"\s+")
+# Sorts after every character, so ``prefix + _MAX_CHAR`` bounds a prefix range.
+_MAX_CHAR = "\U0010ffff"
+# Prefixes up to this length match too many keys to rank per request; their
+# best entries are kept ranked instead, with room to spare so that removing
+# a few of them does not force a new ranking.
+_SHORT_PREFIX = 3
+_TOP_SIZE = 2 * SUGGEST_LIMIT_MAX
+
+
+def normalize(text: str) -> str:
+    """Case-fold, strip accents and collapse whitespace."""
+    decomposed = unicodedata.normalize("NFKD", text.casefold())
+    stripped = "".join(c for c in decomposed if not unicodedata.combining(c))
+    return _SPACES_RE.sub(" ", stripped).strip()
+
+
+def word_suffixes(normalized: str) -> list[str]:
+    """Return the text starting at each word, so inner words match too."""
+    words = normalized.split(" ")
+    return [" ".join(words[i:]) for i in range(len(words))]
+
+
+class Suggestion(NamedTuple):
+    """One completion with the number of books behind it."""
+
+    text: str
+    kind: SuggestionKind
+    popularity: int
+
+
+class _Entry:
+    __slots__ = ("kind", "popularity", "text")
+
+    def __init__(self, kind: SuggestionKind, text: str) -> None:
+        self.kind = kind
+        self.text = text
+        self.popularity = 0
+
+    @property
+    def rank(self) -> tuple[int, int, str]:
+        """Sort key: most popular first, shorter texts first on ties."""
+        return -self.popularity, len(self.text), self.text
+
+
+def short_prefixes(normalized: str) -> set[str]:
+    """Every prefix of at most ``_SHORT_PREFIX`` characters of every word."""
+    return {
+        suffix[:length]
+        for suffix in word_suffixes(normalized)
+        for length in range(1, min(len(suffix), _SHORT_PREFIX) + 1)
+    }
+
+
+class SuggestIndex:
+    """In-process prefix index of book titles and author names.
+
+    Every word suffix of a normalized title or name is kept in one sorted
+    list, so a prefix lookup is two bisects followed by a top-k pass over
+    the matching range. Short prefixes match a large share of the keys, so
+    their best entries are precomputed and kept up to date as popularity
+    changes. Popularity is the number of books carrying a title or written
+    by an author; titles disappear with their last book.
+    """
+
+    def __init__(self) -> None:
+        """Start empty; see ``build_suggest_index``."""
+        self._keys: list[tuple[str, SuggestionKind, str]] = []
+        self._entries: dict[tuple[SuggestionKind, str], _Entry] = {}
+        self._books: dict[int, tuple[str, tuple[str, ...]]] = {}
+        self._top: dict[str, list[_Entry]] = {}
+        # Short prefixes whose ranked list does not hold every entry.
+        self._partial: set[str] = set()
+        self._bytes = 0
+        self._loading = False
+
+    def __len__(self) -> int:
+        """Return the number of suggestible titles and names."""
+        return len(self._entries)
+
+    @staticmethod
+    def _entry_bytes(normalized: str, entry: _Entry) -> int:
+        """Size of one entry with its keys, strings included."""
+        size = sys.getsizeof(entry) + sys.getsizeof(entry.text)
+        size += sys.getsizeof(normalized)
+        size += sys.getsizeof((entry.kind, normalized))
+        for suffix in word_suffixes(normalized):
+            size += sys.getsizeof((suffix, entry.kind, normalized))
+            size += sys.getsizeof(suffix)
+        return size
+
+    @staticmethod
+    def _book_bytes(title: str, names: tuple[str, ...]) -> int:
+        return sys.getsizeof(title) + sys.getsizeof(names) + sys.getsizeof(
+            (title, names)
+        )
+
+    def _add(self, kind: SuggestionKind, text: str, popularity: int) -> None:
+        normalized = normalize(text)
+        if not normalized:
+            return
+        entry = self._entries.get((kind, normalized))
+        if entry is None:
+            entry = self._entries[kind, normalized] = _Entry(kind, text)
+            for suffix in word_suffixes(normalized):
+                if self._loading:
+                    self._keys.append((suffix, kind, normalized))
+                else:
+                    insort(self._keys, (suffix, kind, normalized))
+            self._bytes += self._entry_bytes(normalized, entry)
+        entry.popularity += popularity
+        if not self._loading:
+            self._promote(entry, normalized)
+
+    def _discard(self, kind: SuggestionKind, text: str) -> None:
+        normalized = normalize(text)
+        entry = self._entries.get((kind, normalized))
+        if entry is None:
+            return
+        entry.popularity -= 1
+        if entry.popularity <= 0 and kind == "title":
+            del self._entries[kind, normalized]
+            self._bytes -= self._entry_bytes(normalized, entry)
+            for suffix in word_suffixes(normalized):
+                key = (suffix, kind, normalized)
+                position = bisect_left(self._keys, key)
+                if position < len(self._keys) and self._keys[position] == key:
+                    del self._keys[position]
+        self._demote(entry, normalized)
+
+    def _promote(self, entry: _Entry, normalized: str) -> None:
+        """Move an entry that became more popular up the short-prefix lists."""
+        for prefix in short_prefixes(normalized):
+            top = self._top.setdefault(prefix, [])
+            if entry in top:
+                top.sort(key=lambda e: e.rank)
+            elif prefix not in self._partial or entry.rank < top[-1].rank:
+                insort(top, entry, key=lambda e: e.rank)
+                if len(top) > _TOP_SIZE:
+                    del top[_TOP_SIZE:]
+                    self._partial.add(prefix)
+
+    def _demote(self, entry: _Entry, normalized: str) -> None:
+        """Move a less popular, or removed, entry down the short-prefix lists.
+
+        An entry falling behind the last one of a partial list leaves it,
+        since entries outside the list may now rank higher. A partial list
+        shorter than SUGGEST_LIMIT_MAX is ranked again from the keys.
+        """
+        removed = (entry.kind, normalized) not in self._entries
+        for prefix in short_prefixes(normalized):
+            top = self._top.get(prefix, [])
+            if entry not in top:
+                continue
+            top.remove(entry)
+            partial = prefix in self._partial
+            if not removed and (
+                not partial or not top or entry.rank < top[-1].rank
+            ):
+                insort(top, entry, key=lambda e: e.rank)
+            if partial and len(top) < SUGGEST_LIMIT_MAX:
+                self._set_top(prefix, self._rank(prefix, _TOP_SIZE))
+            elif not top:
+                self._set_top(prefix, top)
+
+    def _set_top(self, prefix: str, top: list[_Entry]) -> None:
+        """Replace the ranked list of a short prefix."""
+        self._partial.discard(prefix)
+        if not top:
+            self._top.pop(prefix, None)
+            return
+        self._top[prefix] = top
+        if len(top) == _TOP_SIZE:
+            self._partial.add(prefix)
+
+    def _rank(self, prefix: str, limit: int) -> list[_Entry]:
+        """Rank every entry with a word starting with ``prefix``."""
+        start = bisect_left(self._keys, (prefix,))
+        stop = bisect_left(self._keys, (prefix + _MAX_CHAR,), lo=start)
+        matches = {
+            (kind, normalized) for _, kind, normalized in self._keys[start:stop]
+        }
+        return heapq.nsmallest(
+            limit,
+            (self._entries[match] for match in matches),
+            key=lambda entry: entry.rank,
+        )
+
+    def _rank_short_prefixes(self) -> None:
+        """Rank every short prefix in one pass over the sorted keys.
+
+        The best entries of a prefix are among the best entries of the
+        longest short prefixes extending it, so only those are ranked in
+        full and shorter prefixes merge their results.
+        """
+        groups: defaultdict[str, set[_Entry]] = defaultdict(set)
+        for suffix, kind, normalized in self._keys:
+            groups[suffix[:_SHORT_PREFIX]].add(self._entries[kind, normalized])
+        candidates: defaultdict[str, set[_Entry]] = defaultdict(set)
+        for group, entries in groups.items():
+            best = heapq.nsmallest(_TOP_SIZE, entries, key=lambda e: e.rank)
+            for length in range(1, len(group) + 1):
+                candidates[group[:length]].update(best)
+        self._top.clear()
+        self._partial.clear()
+        for prefix, entries in candidates.items():
+            self._set_top(
+                prefix,
+                heapq.nsmallest(_TOP_SIZE, entries, key=lambda e: e.rank),
+            )
+
+    @contextmanager
+    def loading(self) -> Iterator[None]:
+        """Defer sorting the keys and ranking short prefixes to the end.
+
+        Inside the block keys are appended unsorted, instead of paying an
+        insertion and a ranking update per change while building.
+        """
+        self._loading = True
+        try:
+            yield
+        finally:
+            self._loading = False
+            self._keys.sort()
+            self._rank_short_prefixes()
+
+    def add_author(self, name: str) -> None:
+        """Make an author suggestible even before they have books."""
+        self._add("author", name, 0)
+
+    def add_book(
+        self, book_id: int, title: str, author_names: Iterable[str]
+    ) -> None:
+        """Index a book, replacing a previous version of it.
+
+        Only what changed is re-counted, so saving a book unchanged leaves
+        the popularity of its title and authors alone.
+        """
+        names = tuple(dict.fromkeys(author_names))
+        old_title, old_names = self._books.get(book_id, (None, ()))
+        if old_title is not None:
+            self._bytes -= self._book_bytes(old_title, old_names)
+        self._books[book_id] = (title, names)
+        self._bytes += self._book_bytes(title, names)
+        if title != old_title:
+            self._add("title", title, 1)
+            if old_title is not None:
+                self._discard("title", old_title)
+        for name in names:
+            if name not in old_names:
+                self._add("author", name, 1)
+        for name in old_names:
+            if name not in names:
+                self._discard("author", name)
+
+    def remove_book(self, book_id: int) -> None:
+        """Forget a book; its authors stay suggestible."""
+        book = self._books.pop(book_id, None)
+        if book is None:
+            return
+        title, names = book
+        self._bytes -= self._book_bytes(title, names)
+        self._discard("title", title)
+        for name in names:
+            self._discard("author", name)
+
+    def clear(self) -> None:
+        """Remove every entry from the index."""
+        self._keys.clear()
+        self._entries.clear()
+        self._books.clear()
+        self._top.clear()
+        self._partial.clear()
+        self._bytes = 0
+
+    def suggest(self, prefix: str, limit: int) -> list[Suggestion]:
+        """Return the ``limit`` most popular matches of ``prefix``.
+
+        Titles and names match when one of their words starts with
+        ``prefix``; shorter texts come first on ties.
+        """
+        prefix = normalize(prefix)
+        if not prefix:
+            return []
+        if len(prefix) <= _SHORT_PREFIX and limit <= SUGGEST_LIMIT_MAX:
+            best = self._top.get(prefix, [])[:limit]
+        else:
+            best = self._rank(prefix, limit)
+        return [Suggestion(e.text, e.kind, e.popularity) for e in best]
+
+    def memory_bytes(self) -> int:
+        """Approximate memory held by the index, strings included."""
+        return (
+            self._bytes
+            + sys.getsizeof(self._keys)
+            + sys.getsizeof(self._entries)
+            + sys.getsizeof(self._books)
+            + sys.getsizeof(self._top)
+            + sum(
+                sys.getsizeof(prefix) + sys.getsizeof(top)
+                for prefix, top in self._top.items()
+            )
+        )
+
+    def stats(self) -> dict[str, int]:
+        """Entry, key and book counts with the approximate memory use."""
+        return {
+            "entries": len(self._entries),
+            "keys": len(self._keys),
+            "books": len(self._books),
+            "memory_bytes": self.memory_bytes(),
+        }
+
+
+suggest_index = SuggestIndex()
+register_index("suggest", suggest_index)
+
+
+async def build_suggest_index() -> None:
+    """Load every author and every book title into ``suggest_index``."""
+    suggest_index.clear()
+    with suggest_index.loading():
+        async for name in AuthorRepository().stream_names():
+            suggest_index.add_author(name)
+        current_id: int | None = None
+        title = ""
+        names: list[str] = []
+        async for book_id, book_title, author_name in (
+            BookRepository().stream_search_documents()
+        ):
+            if book_id != current_id:
+                if current_id is not None:
+                    suggest_index.add_book(current_id, title, names)
+                current_id, title, names = book_id, book_title, []
+            if author_name:
+                names.append(author_name)
+        if current_id is not None:
+            suggest_index.add_book(current_id, title, names)
@@ -1,8 +1,6 @@
 import logging
 from datetime import datetime
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 def clean_empty_values(value: str | list) -> str | list:
@@ -12,7 +10,6 @@ def clean_empty_values(value: str | list) -> str | list:
         if not value:
             logger.error("List is empty.")
             raise ValueError("List must not be empty")
-        logger.info("List value validated successfully.")
         return value
 
     if isinstance(value, str):
@@ -20,7 +17,6 @@ def clean_empty_values(value: str | list) -> str | list:
         if not v:
             logger.error("String is empty after stripping.")
             raise ValueError("String must not be empty")
-        logger.info("String value validated successfully.")
         return v
 
 
@@ -0,0 +1,86 @@
+"""Bounded LRU cache with optional expiry."""
+
+import math
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from typing import Protocol
+
+
+class TTLCache[Key: Hashable, Value]:
+    """Bounded in-process LRU mapping with per-entry expiry.
+
+    Entries are evicted least recently used first once ``maxsize`` is
+    reached and are dropped lazily when read after their deadline. Not
+    thread safe: it is meant to be used from the event loop only.
+    """
+
+    def __init__(self, maxsize: int, ttl: float | None = None) -> None:
+        """Hold up to ``maxsize`` entries, for ``ttl`` seconds if given."""
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data: OrderedDict[Key, tuple[float, Value]] = OrderedDict()
+
+    def __len__(self) -> int:
+        """Count entries, expired ones not yet dropped included."""
+        return len(self._data)
+
+    def get(self, key: Key) -> Value | None:
+        """Return a live cached value, or None on a miss."""
+        item = self._data.get(key)
+        if item is None:
+            self.misses += 1
+            return None
+        expires_at, value = item
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            self.misses += 1
+            return None
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Key, value: Value, ttl: float | None = None) -> None:
+        """Store a value, using the cache default ttl unless one is given."""
+        ttl = self.ttl if ttl is None else ttl
+        if ttl is not None and ttl <= 0:
+            return
+        expires_at = math.inf if ttl is None else time.monotonic() + ttl
+        self._data[key] = (expires_at, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def pop(self, key: Key) -> None:
+        """Drop a key if it is cached."""
+        self._data.pop(key, None)
+
+    def discard_where(self, predicate: Callable[[Key, Value], bool]) -> int:
+        """Drop every entry matching ``predicate``; return how many."""
+        stale = [
+            key
+            for key, (_, value) in self._data.items()
+            if predicate(key, value)
+        ]
+        for key in stale:
+            del self._data[key]
+        return len(stale)
+
+    def clear(self) -> None:
+        """Drop every entry."""
+        self._data.clear()
+
+
+class SharedCacheBackend(Protocol):
+    """Cache tier shared between worker processes, e.g. Redis or memcached."""
+
+    async def get(self, key: str) -> bytes | None:
+        """Return the stored value or None."""
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        """Store a value for ``ttl`` seconds."""
+
+    async def delete(self, *keys: str) -> None:
+        """Drop the given keys."""
@@ -1,26 +1,229 @@
+import asyncio
 import logging
-from collections.abc import AsyncGenerator
-from contextlib import asynccontextmanager
+import time
+from collections.abc import AsyncGenerator, Callable, Iterator
+from contextlib import AsyncExitStack, contextmanager
+from contextvars import ContextVar
+from typing import Any
 
-from fastapi import FastAPI
-from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import (
+    AsyncConnection,
+    async_sessionmaker,
+    create_async_engine,
+)
 from sqlalchemy.ext.asyncio.session import AsyncSession
 from sqlalchemy.orm import declarative_base
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
-from core.settings import ASYNC_DATABASE_URL, DEBUG
+from core.settings import (
+    ASYNC_DATABASE_URL,
+    DB_MAX_OVERFLOW,
+    DB_POOL_PRE_PING,
+    DB_POOL_RECYCLE,
+    DB_POOL_SIZE,
+    DB_POOL_TIMEOUT,
+    DB_POOL_WARMUP,
+    DB_PREPARED_STATEMENT_CACHE_SIZE,
+    DB_QUERY_BUDGET,
+    DB_QUERY_BUDGET_STRICT,
+    DB_SLOW_QUERY_SECONDS,
+    DEBUG,
+    SQLITE_DATABASE_URL,
+)
 
 logger = logging.getLogger(__name__)
 
 Base = declarative_base()
 
+
+class TimedQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool that records how long callers wait for a connection."""
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.checkouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+    def _do_get(self) -> Any:
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            waited = time.perf_counter() - started
+            self.checkouts += 1
+            self.wait_seconds_total += waited
+            self.wait_seconds_max = max(self.wait_seconds_max, waited)
+
+    def recreate(self) -> "TimedQueuePool":
+        pool = super().recreate()
+        pool.checkouts = self.checkouts
+        pool.wait_seconds_total = self.wait_seconds_total
+        pool.wait_seconds_max = self.wait_seconds_max
+        return pool
+
+
+_pool_options: dict[str, Any] = {
+    "poolclass": TimedQueuePool,
+    "pool_size": DB_POOL_SIZE,
+    "max_overflow": DB_MAX_OVERFLOW,
+    "pool_timeout": DB_POOL_TIMEOUT,
+    "pool_recycle": DB_POOL_RECYCLE,
+    "pool_pre_ping": DB_POOL_PRE_PING,
+}
+
 if DEBUG:
-    engine = create_async_engine("sqlite+aiosqlite:///books.db")
+    engine = create_async_engine(SQLITE_DATABASE_URL, **_pool_options)
 else:
-    engine = create_async_engine(ASYNC_DATABASE_URL, echo=False, future=True)
+    engine = create_async_engine(
+        ASYNC_DATABASE_URL,
+        echo=False,
+        future=True,
+        connect_args={
+            "prepared_statement_cache_size": DB_PREPARED_STATEMENT_CACHE_SIZE,
+        },
+        **_pool_options,
+    )
 
 new_session = async_sessionmaker(engine, expire_on_commit=False)
 
 
+class QueryBudgetExceededError(RuntimeError):
+    """A request issued more SQL statements than its declared budget."""
+
+
+class QueryStats:
+    """SQL statements issued and database time spent by one request."""
+
+    def __init__(
+        self,
+        route: str = "-",
+        budget: int = 0,
+        scope: dict[str, Any] | None = None,
+    ) -> None:
+        self.budget = budget
+        self.statements = 0
+        self.seconds = 0.0
+        self._route = route
+        self._scope = scope
+
+    @property
+    def route(self) -> str:
+        """Templated route once the request has been routed."""
+        route = self._scope.get("route") if self._scope is not None else None
+        if route is None:
+            return self._route
+        return f"{self._scope['method']} {route.path}"
+
+    @property
+    def over_budget(self) -> bool:
+        """Whether more statements ran than a non-zero budget allows."""
+        return 0 < self.budget < self.statements
+
+    def check_budget(self) -> None:
+        """Warn about, or in strict mode raise on, an exceeded budget."""
+        if not self.over_budget:
+            return
+        message = (
+            f"{self.route} issued {self.statements} SQL statements, "
+            f"budget is {self.budget}"
+        )
+        if DB_QUERY_BUDGET_STRICT:
+            raise QueryBudgetExceededError(message)
+        logger.warning(message)
+
+
+_query_stats: ContextVar[QueryStats | None] = ContextVar(
+    "query_stats", default=None
+)
+
+
+@contextmanager
+def track_queries(
+    route: str = "-",
+    budget: int = DB_QUERY_BUDGET,
+    scope: dict[str, Any] | None = None,
+) -> Iterator[QueryStats]:
+    """Count statements executed inside the block, e.g. in a test."""
+    stats = QueryStats(route, budget, scope)
+    token = _query_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _query_stats.reset(token)
+
+
+def current_query_stats() -> QueryStats | None:
+    """Return the statistics of the request being served, if any."""
+    return _query_stats.get()
+
+
+def query_budget(limit: int) -> Callable[[], None]:
+    """Return a route dependency declaring how many statements it may issue."""
+
+    def _declare_budget() -> None:
+        stats = _query_stats.get()
+        if stats is not None:
+            stats.budget = limit
+
+    return _declare_budget
+
+
+@event.listens_for(engine.sync_engine, "before_cursor_execute", named=True)
+def _start_query_timer(conn: Any, **_: Any) -> None:
+    conn.info["query_started"] = time.perf_counter()
+
+
+@event.listens_for(engine.sync_engine, "after_cursor_execute", named=True)
+def _record_query(
+    conn: Any,
+    statement: str,
+    parameters: Any,
+    **_: Any,
+) -> None:
+    elapsed = time.perf_counter() - conn.info.pop("query_started")
+    stats = _query_stats.get()
+    if stats is not None:
+        stats.statements += 1
+        stats.seconds += elapsed
+    if elapsed >= DB_SLOW_QUERY_SECONDS:
+        logger.warning(
+            "Slow query (%.3fs) from %s: %s | parameters: %r",
+            elapsed,
+            stats.route if stats is not None else "-",
+            statement,
+            parameters,
+        )
+
+
+class QueryStatsMiddleware:
+    """Track SQL statements per HTTP request and enforce the query budget."""
+
+    def __init__(self, app: Any) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Any, receive: Any, send: Any) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        outer = _query_stats.get()
+        route = f"{scope['method']} {scope['path']}"
+        with track_queries(route, scope=scope) as stats:
+            await self.app(scope, receive, send)
+        if outer is not None:
+            # An enclosing track_queries(), e.g. around a test client call.
+            outer.statements += stats.statements
+            outer.seconds += stats.seconds
+        logger.debug(
+            "%s: %s statements in %.1f ms",
+            stats.route,
+            stats.statements,
+            stats.seconds * 1000,
+        )
+        stats.check_budget()
+
+
 async def create_tables() -> None:
     """Create all tables in the database based on SQLAlchemy Base metadata."""
     logger.info("Creating tables...")
@@ -37,18 +240,41 @@ async def delete_tables() -> None:
     logger.info("Tables dropped successfully.")
 
 
+async def warm_up_pool(size: int = DB_POOL_WARMUP) -> None:
+    """Open ``size`` pooled connections so first requests reuse them."""
+
+    async def _open(stack: AsyncExitStack) -> AsyncConnection:
+        conn = await stack.enter_async_context(engine.connect())
+        await conn.execute(text("SELECT 1"))
+        return conn
+
+    async with AsyncExitStack() as stack:
+        await asyncio.gather(*(_open(stack) for _ in range(size)))
+    logger.info("Database pool warmed up with %s connections.", size)
+
+
+def pool_status() -> dict[str, int | float]:
+    """Return live connection pool statistics."""
+    pool = engine.pool
+    checkouts = getattr(pool, "checkouts", 0)
+    wait_total = getattr(pool, "wait_seconds_total", 0.0)
+    return {
+        "size": pool.size(),
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        "overflow": pool.overflow(),
+        "checkouts": checkouts,
+        "wait_seconds_avg": wait_total / checkouts if checkouts else 0.0,
+        "wait_seconds_max": getattr(pool, "wait_seconds_max", 0.0),
+    }
+
+
 async def get_async_session() -> AsyncGenerator[AsyncSession]:
-    """Asynchronous context manager that yields a SQLAlchemy AsyncSession."""
-    logger.info("Creating a new async database session.")
+    """Yield the request-scoped AsyncSession shared by all services.
+
+    FastAPI caches this dependency per request, so every repository works on
+    one connection and one transaction. Anything not committed by a service
+    is rolled back when the session closes.
+    """
     async with new_session() as session:
         yield session
-
-
-@asynccontextmanager
-async def lifespan(app: FastAPI) -> AsyncGenerator[None]:
-    """Lifespan context manager for FastAPI application."""
-    await create_tables()
-    try:
-        yield
-    finally:
-        logger.info("Application shutdown process complete.")
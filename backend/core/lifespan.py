@@ -0,0 +1,41 @@
+"""Application startup and shutdown."""
+
+import asyncio
+import logging
+from collections.abc import AsyncGenerator
+from contextlib import asynccontextmanager, suppress
+
+from auth.services.secure import hashing_pool
+from auth.sweeper import run_refresh_token_sweeper
+from books.search import build_book_search_index
+from books.suggest import build_suggest_index
+from fastapi import FastAPI
+
+from core.db import create_tables, warm_up_pool
+from core.settings import DEBUG
+
+logger = logging.getLogger(__name__)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncGenerator[None]:
+    """Lifespan context manager for FastAPI application.
+
+    Postgres is migrated with ``alembic upgrade head``; the DEBUG SQLite
+    database is created from the models.
+    """
+    if DEBUG:
+        await create_tables()
+    await warm_up_pool()
+    await build_suggest_index()
+    if DEBUG:
+        await build_book_search_index()
+    sweeper = asyncio.create_task(run_refresh_token_sweeper())
+    try:
+        yield
+    finally:
+        sweeper.cancel()
+        with suppress(asyncio.CancelledError):
+            await sweeper
+        hashing_pool.shutdown()
+        logger.info("Application shutdown process complete.")
@@ -1,51 +1,199 @@
+import atexit
+import copy
+import json
 import logging
+import queue
 from logging.config import dictConfig
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any
 
-LOGGING_CONFIG = {
-    "version": 1,
-    "disable_existing_loggers": False,
-    "formatters": {
-        "default": {
-            "format": "%(asctime)s | %(levelname)-8s | %(name)s | %(message)s",
-            "datefmt": "%Y-%m-%d %H:%M:%S",
-        },
-        "uvicorn": {
-            "format": "%(asctime)s | %(levelname)-8s | %(name)s | %(message)s",
-            "datefmt": "%Y-%m-%d %H:%M:%S",
-        },
-    },
-    "handlers": {
-        "default": {
-            "formatter": "default",
-            "class": "logging.StreamHandler",
-            "stream": "ext://sys.stdout",
-        },
-        "uvicorn": {
-            "formatter": "uvicorn",
-            "class": "logging.StreamHandler",
-            "stream": "ext://sys.stdout",
-        },
-    },
-    "loggers": {
-        "": {  # root logger
-            "handlers": ["default"],
-            "level": "INFO",
-        },
-        "uvicorn": {
-            "handlers": ["uvicorn"],
+TEXT_FORMAT = "%(asctime)s | %(levelname)-8s | %(name)s | %(message)s"
+DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# Attributes every LogRecord has; anything else was passed via ``extra``.
+_RECORD_ATTRS = frozenset(
+    vars(logging.LogRecord("", 0, "", 0, "", None, None)).keys()
+) | {"message", "asctime", "taskName"}
+
+
+class JSONFormatter(logging.Formatter):
+    """Render a record as one JSON object per line."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry: dict[str, Any] = {
+            "time": self.formatTime(record, self.datefmt),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exc_info"] = record.exc_text
+        entry.update(
+            {
+                key: value
+                for key, value in vars(record).items()
+                if key not in _RECORD_ATTRS
+            }
+        )
+        return json.dumps(entry, default=str)
+
+
+class SamplingFilter(logging.Filter):
+    """Keep only a share of the records of chosen loggers.
+
+    ``rates`` maps a logger name to the share of its records (and those of
+    its children) to keep. Kept records are evenly spaced rather than drawn
+    at random: each record adds the rate to its logger's credit and passes
+    once the credit reaches one. Warnings and errors are never dropped.
+    """
+
+    def __init__(self, rates: dict[str, float] | None = None) -> None:
+        super().__init__()
+        self.rates = rates or {}
+        self._resolved: dict[str, float] = {}
+        self._credit: dict[str, float] = {}
+
+    def _rate(self, name: str) -> float:
+        rate = self._resolved.get(name)
+        if rate is None:
+            prefix = name
+            while prefix not in self.rates and "." in prefix:
+                prefix = prefix.rpartition(".")[0]
+            rate = self.rates.get(prefix, 1.0)
+            self._resolved[name] = rate
+        return rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+        rate = self._rate(record.name)
+        if rate >= 1.0:
+            return True
+        credit = self._credit.get(record.name, 0.0) + rate
+        keep = credit >= 1.0
+        self._credit[record.name] = credit - 1.0 if keep else credit
+        return keep
+
+
+class DroppingQueueHandler(QueueHandler):
+    """Queue handler that drops records instead of blocking on a full queue.
+
+    Only records below WARNING are dropped, and counted in ``dropped``;
+    warnings and errors wait for room in the queue.
+    """
+
+    dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """Merge the message arguments but leave formatting to the listener.
+
+        The traceback is rendered here, while it is still current, and kept
+        apart from the message so structured output can report it separately.
+        """
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(
+                record.exc_info
+            )
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        if record.levelno >= logging.WARNING:
+            self.queue.put(record)
+            return
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+def parse_logger_map(raw: str) -> dict[str, str]:
+    """Parse ``"name=value,other=value"`` into a dict."""
+    pairs = (item.split("=", 1) for item in raw.split(",") if "=" in item)
+    return {name.strip(): value.strip() for name, value in pairs}
+
+
+def build_logging_config(
+    fmt: str = "text",
+    level: str = "INFO",
+    levels: dict[str, str] | None = None,
+    sample_rates: dict[str, float] | None = None,
+    queue_size: int = 10000,
+) -> dict[str, Any]:
+    """Return a ``dictConfig`` routing every logger through one queue.
+
+    Callers only enqueue the record; a ``QueueListener`` thread formats and
+    writes it to stdout.
+    """
+    loggers: dict[str, dict[str, Any]] = {
+        "": {"handlers": ["queue"], "level": level},
+        "uvicorn": {"handlers": ["queue"], "level": "INFO", "propagate": False},
+        "uvicorn.error": {"level": "INFO"},
+        "uvicorn.access": {
+            "handlers": ["queue"],
             "level": "INFO",
             "propagate": False,
         },
-        "uvicorn.error": {
-            "level": "INFO",
+    }
+    for name, logger_level in (levels or {}).items():
+        loggers.setdefault(name, {})["level"] = logger_level.upper()
+    return {
+        "version": 1,
+        "disable_existing_loggers": False,
+        "formatters": {
+            "text": {"format": TEXT_FORMAT, "datefmt": DATE_FORMAT},
+            "json": {"()": JSONFormatter, "datefmt": "%Y-%m-%dT%H:%M:%S%z"},
         },
-        "uvicorn.access": {
-            "handlers": ["uvicorn"],
-            "level": "INFO",
-            "propagate": False,
+        "filters": {
+            "sampling": {"()": SamplingFilter, "rates": sample_rates or {}},
         },
-    },
-}
+        "handlers": {
+            "default": {
+                "formatter": fmt,
+                "class": "logging.StreamHandler",
+                "stream": "ext://sys.stdout",
+            },
+            "queue": {
+                "class": "core.logger_config.DroppingQueueHandler",
+                "handlers": ["default"],
+                "queue": {"()": "queue.Queue", "maxsize": queue_size},
+                "filters": ["sampling"],
+                "respect_handler_level": True,
+            },
+        },
+        "loggers": loggers,
+    }
+
+
+LOGGING_CONFIG = build_logging_config()
+
+
+def queue_handler() -> DroppingQueueHandler | None:
+    """Return the configured queue handler, if logging has been set up."""
+    handler = logging.getHandlerByName("queue")
+    return handler if isinstance(handler, DroppingQueueHandler) else None
+
+
+def _stop_listener() -> None:
+    """Flush the records still queued and stop the listener thread."""
+    listener: QueueListener | None = getattr(queue_handler(), "listener", None)
+    if listener is not None:
+        listener.stop()
+
+
+def setup_logging(**options: Any) -> None:
+    """Apply the logging config and start the queue listener thread.
+
+    ``options`` are passed to ``build_logging_config``.
+    """
+    _stop_listener()
+    dictConfig(build_logging_config(**options) if options else LOGGING_CONFIG)
+    queue_handler().listener.start()
+
 
-def setup_logging():
-    dictConfig(LOGGING_CONFIG)
\ No newline at end of file
+atexit.register(_stop_listener)
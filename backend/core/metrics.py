@@ -0,0 +1,169 @@
+"""Prometheus metrics for repositories, caches and pools."""
+
+import functools
+import time
+from collections.abc import Awaitable, Callable, Iterator
+from typing import Any, Protocol
+
+from prometheus_client import REGISTRY, Counter, Histogram
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+from prometheus_client.registry import Collector
+
+from core.cache import TTLCache
+from core.db import pool_status
+from core.logger_config import queue_handler
+
+REPOSITORY_OPERATION_SECONDS = Histogram(
+    "repository_operation_seconds",
+    "Time spent in repository operations.",
+    ["repository", "operation"],
+)
+PASSWORD_HASH_SECONDS = Histogram(
+    "password_hash_seconds",
+    "Time from submitting a password hash until it completes.",
+)
+PASSWORD_HASH_REJECTED = Counter(
+    "password_hash_rejected",
+    "Password hashes rejected because the hashing queue was full.",
+)
+
+_caches: dict[str, TTLCache[Any, Any]] = {}
+
+
+class InMemoryIndex(Protocol):
+    """What an in-process index offers to be reported."""
+
+    def __len__(self) -> int:
+        """Return the number of indexed entries."""
+        ...
+
+    def memory_bytes(self) -> int:
+        """Approximate memory held by the index."""
+        ...
+
+    def stats(self) -> dict[str, int]:
+        """Return the figures shown by /internal/indexes."""
+        ...
+
+
+_indexes: dict[str, InMemoryIndex] = {}
+
+
+def register_cache(name: str, cache: TTLCache[Any, Any]) -> None:
+    """Export hit, miss and size figures of ``cache`` under ``name``."""
+    _caches[name] = cache
+
+
+def register_index(name: str, index: InMemoryIndex) -> None:
+    """Export entry count and memory use of an in-process index."""
+    _indexes[name] = index
+
+
+def index_stats() -> dict[str, dict[str, int]]:
+    """``stats()`` of every registered index, keyed by name."""
+    return {name: index.stats() for name, index in _indexes.items()}
+
+
+def timed_operation[**Params, Result](
+    func: Callable[Params, Awaitable[Result]],
+) -> Callable[Params, Awaitable[Result]]:
+    """Record the duration of a repository coroutine method."""
+
+    @functools.wraps(func)
+    async def wrapper(*args: Params.args, **kwargs: Params.kwargs) -> Result:
+        started = time.perf_counter()
+        try:
+            return await func(*args, **kwargs)
+        finally:
+            REPOSITORY_OPERATION_SECONDS.labels(
+                type(args[0]).__name__, func.__name__
+            ).observe(time.perf_counter() - started)
+
+    wrapper.__timed__ = True  # type: ignore[attr-defined]
+    return wrapper
+
+
+class CacheCollector(Collector):
+    """Read hit/miss counters straight from the registered caches."""
+
+    def collect(self) -> Iterator[CounterMetricFamily | GaugeMetricFamily]:
+        """Yield hits, misses and size per cache."""
+        hits = CounterMetricFamily(
+            "cache_hits", "Cache hits.", labels=["cache"]
+        )
+        misses = CounterMetricFamily(
+            "cache_misses", "Cache misses.", labels=["cache"]
+        )
+        size = GaugeMetricFamily(
+            "cache_entries", "Cached entries.", labels=["cache"]
+        )
+        for name, cache in _caches.items():
+            hits.add_metric([name], cache.hits)
+            misses.add_metric([name], cache.misses)
+            size.add_metric([name], len(cache))
+        yield hits
+        yield misses
+        yield size
+
+
+class PoolCollector(Collector):
+    """Expose the database connection pool state.
+
+    ``checkouts`` only ever grows and is exported as a counter, the live
+    figures as gauges.
+    """
+
+    counters = frozenset({"checkouts"})
+
+    def collect(self) -> Iterator[CounterMetricFamily | GaugeMetricFamily]:
+        """Yield one metric per ``pool_status()`` figure."""
+        for key, value in pool_status().items():
+            family = (
+                CounterMetricFamily
+                if key in self.counters
+                else GaugeMetricFamily
+            )
+            yield family(
+                f"db_pool_{key}",
+                f"Database connection pool {key.replace('_', ' ')}.",
+                value=value,
+            )
+
+
+class IndexCollector(Collector):
+    """Report the size of the registered in-process indexes."""
+
+    def collect(self) -> Iterator[GaugeMetricFamily]:
+        """Yield entry counts and memory use per index."""
+        entries = GaugeMetricFamily(
+            "index_entries", "Indexed entries.", labels=["index"]
+        )
+        memory = GaugeMetricFamily(
+            "index_memory_bytes",
+            "Approximate memory held by the index.",
+            labels=["index"],
+        )
+        for name, index in _indexes.items():
+            entries.add_metric([name], len(index))
+            memory.add_metric([name], index.memory_bytes())
+        yield entries
+        yield memory
+
+
+class LoggingCollector(Collector):
+    """Count log records the full logging queue had to drop."""
+
+    def collect(self) -> Iterator[CounterMetricFamily]:
+        """Yield the dropped record count of the queue handler."""
+        handler = queue_handler()
+        yield CounterMetricFamily(
+            "log_records_dropped",
+            "Log records below WARNING dropped because the queue was full.",
+            value=handler.dropped if handler is not None else 0,
+        )
+
+
+REGISTRY.register(CacheCollector())
+REGISTRY.register(PoolCollector())
+REGISTRY.register(IndexCollector())
+REGISTRY.register(LoggingCollector())
@@ -0,0 +1,31 @@
+"""Run the Alembic migrations from application code."""
+
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import Connection, text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from core.db import Base, engine
+from core.settings import BASE_DIR
+
+ALEMBIC_INI = BASE_DIR / "alembic.ini"
+
+
+def upgrade(connection: Connection, revision: str = "head") -> None:
+    """Apply the Alembic migrations up to ``revision`` on ``connection``."""
+    config = Config(ALEMBIC_INI)
+    config.attributes["connection"] = connection
+    command.upgrade(config, revision)
+
+
+async def migrate(conn: AsyncConnection, revision: str = "head") -> None:
+    """Apply the Alembic migrations inside an async transaction."""
+    await conn.run_sync(upgrade, revision)
+
+
+async def reset_database() -> None:
+    """Drop every table, migration history included, and migrate afresh."""
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.execute(text("DROP TABLE IF EXISTS alembic_version"))
+        await migrate(conn)
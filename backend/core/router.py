@@ -0,0 +1,28 @@
+"""Authenticated internal diagnostics endpoints."""
+
+from auth.dependencies import PermissionDependency
+from books.permissions import Is_Authenticated
+from fastapi import APIRouter, Depends
+
+from core.db import pool_status
+from core.metrics import index_stats
+from core.settings import API_URL
+
+internal_router = APIRouter(
+    prefix=f"{API_URL}/internal",
+    tags=["internal"],
+    include_in_schema=False,
+    dependencies=[Depends(PermissionDependency([Is_Authenticated]))],
+)
+
+
+@internal_router.get("/db/pool", response_model=dict[str, int | float])
+async def get_pool_status() -> dict[str, int | float]:
+    """Live database pool usage: checked out, overflow and checkout wait."""
+    return pool_status()
+
+
+@internal_router.get("/indexes", response_model=dict[str, dict[str, int]])
+async def get_index_stats() -> dict[str, dict[str, int]]:
+    """Size and approximate memory use of the in-process indexes."""
+    return index_stats()
@@ -1,15 +1,26 @@
 import os
+import re
 from pathlib import Path
+from typing import Literal, cast, get_args
 
 from dotenv import load_dotenv
 
-from core.logger_config import setup_logging
+from core.logger_config import parse_logger_map, setup_logging
 
 load_dotenv()
 
 BASE_DIR = Path(__file__).resolve().parent.parent
 
-DEBUG = False
+
+def env_flag(name: str, default: str) -> bool:
+    """Read a boolean environment variable, ignoring case."""
+    return os.getenv(name, default).strip().lower() == "true"
+
+# DEBUG runs on a local SQLite file instead of Postgres
+DEBUG: bool = env_flag("DEBUG", "False")
+SQLITE_DATABASE_URL: str = os.getenv(
+    "SQLITE_DATABASE_URL", "sqlite+aiosqlite:///books.db"
+)
 
 
 # JWT
@@ -20,6 +31,29 @@ REFRESH_TOKEN_EXPIRE_DAYS: int = 30
 MAX_AGE_ACCESS_TOKEN = ACCESS_TOKEN_EXPIRE_MINUTES * 60
 MAX_AGE_REFRESH_TOKEN = REFRESH_TOKEN_EXPIRE_DAYS * 30 * 24 * 60
 
+# Expired refresh tokens are deleted every REFRESH_TOKEN_SWEEP_INTERVAL
+# seconds, at most REFRESH_TOKEN_SWEEP_BATCH_SIZE rows per transaction.
+REFRESH_TOKEN_SWEEP_INTERVAL: float = float(
+    os.getenv("REFRESH_TOKEN_SWEEP_INTERVAL", "3600")
+)
+REFRESH_TOKEN_SWEEP_BATCH_SIZE: int = int(
+    os.getenv("REFRESH_TOKEN_SWEEP_BATCH_SIZE", "1000")
+)
+
+# Password hashing pool: "thread" or "process" workers, plus how many hashes
+# may wait for a worker before requests are rejected with 503.
+PASSWORD_HASH_EXECUTOR: str = os.getenv("PASSWORD_HASH_EXECUTOR", "thread")
+PASSWORD_HASH_WORKERS: int = int(
+    os.getenv("PASSWORD_HASH_WORKERS", str(min(4, os.cpu_count() or 1)))
+)
+PASSWORD_HASH_MAX_QUEUE: int = int(os.getenv("PASSWORD_HASH_MAX_QUEUE", "32"))
+
+# Auth caches
+AUTH_CACHE_MAXSIZE: int = int(os.getenv("AUTH_CACHE_MAXSIZE", "10000"))
+AUTH_USER_CACHE_TTL_SECONDS: float = float(
+    os.getenv("AUTH_USER_CACHE_TTL_SECONDS", "60")
+)
+
 # Api Version
 API_VERSION = "v1"
 API_URL = f"/api/{API_VERSION}"
@@ -33,7 +67,29 @@ POSTGRES_PORT = os.getenv("POSTGRES_PORT", "5432")
 
 ASYNC_DATABASE_URL = f"postgresql+asyncpg://{POSTGRES_USER}:{POSTGRES_PASSWORD}@{POSTGRES_HOST}:{POSTGRES_PORT}/{POSTGRES_DB}"
 
+# Connection pool
+DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "10"))
+DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT: float = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE: int = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+DB_POOL_PRE_PING: bool = env_flag("DB_POOL_PRE_PING", "True")
+# Connections opened during startup, at most DB_POOL_SIZE stay in the pool.
+DB_POOL_WARMUP: int = int(os.getenv("DB_POOL_WARMUP", str(DB_POOL_SIZE)))
+DB_PREPARED_STATEMENT_CACHE_SIZE: int = int(
+    os.getenv("DB_PREPARED_STATEMENT_CACHE_SIZE", "500")
+)
+
+# Query instrumentation: statements slower than DB_SLOW_QUERY_SECONDS are
+# logged with their parameters. DB_QUERY_BUDGET is the default number of
+# statements a request may issue (0 disables it); in strict mode going over
+# the budget raises instead of logging a warning, which fails tests.
+DB_SLOW_QUERY_SECONDS: float = float(os.getenv("DB_SLOW_QUERY_SECONDS", "0.2"))
+DB_QUERY_BUDGET: int = int(os.getenv("DB_QUERY_BUDGET", "0"))
+DB_QUERY_BUDGET_STRICT: bool = env_flag("DB_QUERY_BUDGET_STRICT", "False")
+
 
+# Position in this tuple is the genre's bit in books.genre_mask: only ever
+# append new genres.
 ALLOWED_GENRES = (
     "Fiction",
     "Non-Fiction",
@@ -42,5 +98,82 @@ ALLOWED_GENRES = (
     "History",
     "Biography",
 )
+# Which stored representation genre filters and facets read: the "array"
+# column or the integer "bitmask" kept alongside it.
+GenreFilterMode = Literal["array", "bitmask"]
+GENRE_FILTER_MODE = cast(
+    GenreFilterMode, os.getenv("GENRE_FILTER_MODE", "array")
+)
+if GENRE_FILTER_MODE not in get_args(GenreFilterMode):
+    raise ValueError(
+        f"GENRE_FILTER_MODE={GENRE_FILTER_MODE!r} must be one of "
+        f"{', '.join(get_args(GenreFilterMode))}"
+    )
+
+# Search
+# Share of query trigrams a title/author must contain, same as the default
+# pg_trgm.word_similarity_threshold used by the Postgres "<%" operator.
+SEARCH_WORD_SIMILARITY_THRESHOLD: float = 0.6
+# Postgres text search configuration of books.search_vector and full-text
+# queries, an optionally schema-qualified name. Migration 0004 bakes it into
+# the search triggers.
+SEARCH_TEXT_CONFIG: str = os.getenv("SEARCH_TEXT_CONFIG", "english")
+if not re.fullmatch(r"[A-Za-z_]\w*(\.[A-Za-z_]\w*)?", SEARCH_TEXT_CONFIG):
+    raise ValueError(
+        f"SEARCH_TEXT_CONFIG={SEARCH_TEXT_CONFIG!r} is not a text search "
+        "configuration name"
+    )
+# Most suggestions one /books/suggest request may ask for
+SUGGEST_LIMIT_MAX: int = int(os.getenv("SUGGEST_LIMIT_MAX", "20"))
+
+# Book read-through cache: serialized books kept in-process for
+# BOOK_CACHE_TTL_SECONDS, which also bounds how stale a book can be in other
+# workers after it changed.
+BOOK_CACHE_MAXSIZE: int = int(os.getenv("BOOK_CACHE_MAXSIZE", "10000"))
+BOOK_CACHE_TTL_SECONDS: float = float(os.getenv("BOOK_CACHE_TTL_SECONDS", "60"))
+
+# Author name -> id lookups kept in-process; author names never change, so
+# the ttl only bounds how long a deleted author can still be resolved.
+AUTHOR_CACHE_MAXSIZE: int = int(os.getenv("AUTHOR_CACHE_MAXSIZE", "50000"))
+AUTHOR_CACHE_TTL_SECONDS: float = float(
+    os.getenv("AUTHOR_CACHE_TTL_SECONDS", "3600")
+)
+
+# Genre/decade facet counts are cached per filter set for this long
+FACETS_CACHE_TTL_SECONDS: float = float(
+    os.getenv("FACETS_CACHE_TTL_SECONDS", "60")
+)
+
+# Most book ids accepted by one /books/batch request
+BOOK_BATCH_MAX_IDS: int = int(os.getenv("BOOK_BATCH_MAX_IDS", "100"))
+
+# Rows fetched per round trip while streaming /books/export
+BOOK_EXPORT_CHUNK_SIZE: int = int(os.getenv("BOOK_EXPORT_CHUNK_SIZE", "1000"))
 
-setup_logging()
+# Bulk upload
+BULK_UPLOAD_CHUNK_SIZE: int = int(os.getenv("BULK_UPLOAD_CHUNK_SIZE", "1000"))
+
+# Logging: "text" or "json" lines written by a background thread. LOG_LEVELS
+# and LOG_SAMPLE_RATES take "logger=value" pairs separated by commas, e.g.
+# "sqlalchemy.engine=WARNING" or "uvicorn.access=0.1" to keep 10% of the
+# access log. Once LOG_QUEUE_SIZE records wait to be written, further records
+# below WARNING are dropped (see log_records_dropped_total); warnings and errors
+# wait for room.
+LOG_FORMAT: str = os.getenv("LOG_FORMAT", "text")
+LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO").upper()
+LOG_LEVELS: dict[str, str] = parse_logger_map(os.getenv("LOG_LEVELS", ""))
+LOG_SAMPLE_RATES: dict[str, float] = {
+    name: float(rate)
+    for name, rate in parse_logger_map(
+        os.getenv("LOG_SAMPLE_RATES", "")
+    ).items()
+}
+LOG_QUEUE_SIZE: int = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+
+setup_logging(
+    fmt=LOG_FORMAT,
+    level=LOG_LEVEL,
+    levels=LOG_LEVELS,
+    sample_rates=LOG_SAMPLE_RATES,
+    queue_size=LOG_QUEUE_SIZE,
+)
@@ -2,13 +2,26 @@ import logging
 
 from auth.router import auth_router
 from books.routers import author_router, book_router
-from core.db import lifespan
+from core.db import QueryStatsMiddleware
+from core.lifespan import lifespan
+from core.router import internal_router
 from fastapi import FastAPI
+from starlette_exporter import PrometheusMiddleware, handle_metrics
 
 logger = logging.getLogger(__name__)
 
 app = FastAPI(lifespan=lifespan)
+app.add_middleware(
+    PrometheusMiddleware,
+    app_name="books_api",
+    prefix="http",
+    group_paths=True,
+    skip_paths=["/metrics"],
+)
+app.add_middleware(QueryStatsMiddleware)
+app.add_route("/metrics", handle_metrics)
 
 app.include_router(auth_router)
 app.include_router(book_router)
 app.include_router(author_router)
+app.include_router(internal_router)
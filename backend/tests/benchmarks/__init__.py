@@ -0,0 +1,10 @@
+"""Load and micro benchmarks of the API.
+
+Run from ``backend/``::
+
+    python -m tests.benchmarks --sqlite --books 5000 --output bench.json
+
+Without ``--sqlite`` the scenarios run against the Postgres configured in
+``.env``. The JSON written to ``--output`` holds throughput and latency
+percentiles per scenario, so two runs can be diffed directly.
+"""
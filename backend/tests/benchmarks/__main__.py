@@ -0,0 +1,106 @@
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+from pathlib import Path
+from typing import Any
+
+from tests.benchmarks.stats import environment, write_results
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python -m tests.benchmarks",
+        description="Run the API load scenarios and micro-benchmarks.",
+    )
+    parser.add_argument("--books", type=int, default=2000)
+    parser.add_argument("--authors", type=int, default=300)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument(
+        "--login-requests",
+        type=int,
+        default=50,
+        help="login is bound by bcrypt, so it runs fewer requests",
+    )
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument(
+        "--scenario",
+        action="append",
+        dest="scenarios",
+        help="run only this load scenario, may be repeated",
+    )
+    parser.add_argument("--micro-number", type=int, default=2000)
+    parser.add_argument("--skip-load", action="store_true")
+    parser.add_argument("--skip-micro", action="store_true")
+    parser.add_argument(
+        "--sqlite",
+        action="store_true",
+        help="use a throwaway SQLite database (DEBUG mode) instead of Postgres",
+    )
+    parser.add_argument(
+        "--reset",
+        action="store_true",
+        help="drop all tables before seeding; implied by --sqlite",
+    )
+    parser.add_argument(
+        "--output", type=Path, help="write the JSON results here"
+    )
+    return parser.parse_args(argv)
+
+
+def configure_environment(args: argparse.Namespace) -> None:
+    """Point the settings at the benchmark database before they are imported."""
+    os.environ.setdefault("SECRET_KEY_JWT", "benchmark-secret")
+    os.environ.setdefault("ALGORITHM_JWT", "HS256")
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+    if args.sqlite:
+        path = Path(tempfile.mkdtemp(prefix="books-bench-")) / "bench.db"
+        os.environ["DEBUG"] = "True"
+        os.environ["SQLITE_DATABASE_URL"] = f"sqlite+aiosqlite:///{path}"
+        args.reset = True
+
+
+async def run(args: argparse.Namespace) -> dict[str, Any]:
+    """Seed, load-test and micro-benchmark as ``args`` say."""
+    # The settings are read on import, after configure_environment().
+    from core.db import engine  # noqa: PLC0415
+
+    from tests.benchmarks.catalog import Catalog  # noqa: PLC0415
+    from tests.benchmarks.micro import run_micro  # noqa: PLC0415
+    from tests.benchmarks.scenarios import run_load  # noqa: PLC0415
+
+    catalog = Catalog(books=args.books, authors=args.authors, seed=args.seed)
+    results: dict[str, Any] = {
+        "environment": {**environment(), "database": engine.dialect.name},
+        "parameters": {
+            key: str(value) if isinstance(value, Path) else value
+            for key, value in vars(args).items()
+        },
+    }
+    if not args.skip_load:
+        results["load"] = await run_load(
+            catalog,
+            requests=args.requests,
+            concurrency=args.concurrency,
+            only=args.scenarios,
+            login_requests=args.login_requests,
+            reset=args.reset,
+        )
+    if not args.skip_micro:
+        results["micro"] = run_micro(number=args.micro_number, catalog=catalog)
+    return results
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = parse_args(argv)
+    configure_environment(args)
+    results = asyncio.run(run(args))
+    text = write_results(results, args.output)
+    if args.output is None:
+        sys.stdout.write(text + "\n")
+
+
+if __name__ == "__main__":
+    main()
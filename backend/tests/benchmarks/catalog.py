@@ -0,0 +1,100 @@
+import random
+from collections.abc import Iterator, Sequence
+from dataclasses import dataclass, field
+from typing import Any
+
+from core.settings import ALLOWED_GENRES
+
+_TITLE_WORDS = (
+    "shadow", "river", "empire", "garden", "winter", "machine", "silent",
+    "crown", "ocean", "letters", "glass", "forgotten", "north", "city",
+    "fire", "stone", "night", "atlas", "harvest", "signal", "orbit",
+    "kingdom", "memory", "storm", "paper", "iron", "light", "voyage",
+)
+_FIRST_NAMES = (
+    "Ada", "Boris", "Clara", "Dmitri", "Elena", "Farid", "Grace", "Hugo",
+    "Ines", "Jonas", "Keiko", "Liam", "Maya", "Nikolai", "Olga", "Pablo",
+)
+_LAST_NAMES = (
+    "Archer", "Brennan", "Castillo", "Dvorak", "Eriksen", "Fontaine",
+    "Gallo", "Hartmann", "Ivanova", "Jensen", "Kowalski", "Lindqvist",
+    "Moreau", "Nakamura", "Okafor", "Petrov", "Quinn", "Rossi",
+)
+
+
+def zipf_weights(n: int, s: float = 1.1) -> list[float]:
+    """Return Zipf weights for ranks ``1..n``: a few items dominate."""
+    return [1 / rank**s for rank in range(1, n + 1)]
+
+
+@dataclass
+class Catalog:
+    """Synthetic books and authors, identical for identical parameters.
+
+    Author popularity and genre frequency follow a Zipf distribution, so a
+    handful of authors and genres cover most books, like a real catalog.
+    """
+
+    books: int = 1000
+    authors: int = 200
+    seed: int = 42
+    genre_weights: Sequence[float] = field(
+        default_factory=lambda: zipf_weights(len(ALLOWED_GENRES))
+    )
+    max_authors_per_book: int = 3
+    max_genres_per_book: int = 3
+    year_range: tuple[int, int] = (1900, 2024)
+
+    def __post_init__(self) -> None:
+        """Generate the authors and books from ``seed``."""
+        rng = random.Random(self.seed)
+        self.author_names = self._author_names(rng)
+        self.author_weights = zipf_weights(len(self.author_names))
+        self.rows = [self._book(rng, index) for index in range(self.books)]
+
+    def _author_names(self, rng: random.Random) -> list[str]:
+        names: dict[str, None] = {}
+        while len(names) < self.authors:
+            name = f"{rng.choice(_FIRST_NAMES)} {rng.choice(_LAST_NAMES)}"
+            if name in names:
+                name = f"{name} {len(names)}"
+            names[name] = None
+        return list(names)
+
+    def _sample(
+        self,
+        rng: random.Random,
+        population: Sequence[str],
+        weights: Sequence[float],
+        upto: int,
+    ) -> list[str]:
+        picked = rng.choices(population, weights, k=rng.randint(1, upto))
+        return list(dict.fromkeys(picked))
+
+    def _book(self, rng: random.Random, index: int) -> dict[str, Any]:
+        words = rng.sample(_TITLE_WORDS, k=rng.randint(1, 3))
+        return {
+            "title": f"{' '.join(words).title()} {index}",
+            "authors": self._sample(
+                rng,
+                self.author_names,
+                self.author_weights,
+                self.max_authors_per_book,
+            ),
+            "genres": self._sample(
+                rng,
+                ALLOWED_GENRES,
+                self.genre_weights,
+                self.max_genres_per_book,
+            ),
+            "published_year": rng.randint(*self.year_range),
+        }
+
+    def chunks(self, size: int) -> Iterator[list[dict[str, Any]]]:
+        """Yield the books in ``size`` sized bulk upload payloads."""
+        for start in range(0, len(self.rows), size):
+            yield self.rows[start : start + size]
+
+    def search_terms(self) -> list[str]:
+        """Title words and author surnames worth searching for."""
+        return [*_TITLE_WORDS, *(name.split()[1] for name in self.author_names)]
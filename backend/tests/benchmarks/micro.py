@@ -0,0 +1,90 @@
+import datetime as dt
+import time
+from collections.abc import Callable
+from types import SimpleNamespace
+from typing import Any
+
+from auth.services.secure import Hasher
+from auth.services.token import TokenManager
+from books.schemas import BookOutSchema
+from books.serializers import dump_book, dump_page
+
+from tests.benchmarks.catalog import Catalog
+from tests.benchmarks.stats import summarize
+
+
+def measure(func: Callable[[], Any], number: int) -> dict[str, float | int]:
+    """Time ``number`` calls of ``func`` one by one."""
+    latencies: list[float] = []
+    started = time.perf_counter()
+    for _ in range(number):
+        call_started = time.perf_counter()
+        func()
+        latencies.append(time.perf_counter() - call_started)
+    return summarize(latencies, time.perf_counter() - started)
+
+
+def _orm_like_books(catalog: Catalog, count: int) -> list[SimpleNamespace]:
+    """Objects shaped like loaded ``BookModel`` rows."""
+    now = dt.datetime(2024, 1, 1, tzinfo=dt.UTC)
+    return [
+        SimpleNamespace(
+            id=index,
+            title=row["title"],
+            authors=[SimpleNamespace(name=name) for name in row["authors"]],
+            genres=row["genres"],
+            published_year=row["published_year"],
+            created_at=now,
+            updated_at=now,
+        )
+        for index, row in enumerate(catalog.rows[:count], start=1)
+    ]
+
+
+def run_micro(
+    number: int = 1000,
+    hash_number: int = 5,
+    catalog: Catalog | None = None,
+) -> dict[str, dict[str, float | int]]:
+    """Benchmark password hashing, JWT handling and book serialization.
+
+    bcrypt is slow by design, so hashing runs ``hash_number`` times only.
+    """
+    catalog = catalog or Catalog(books=100)
+    password = "bench-password"
+    hashed = Hasher.hash_password(password)
+    token = TokenManager.generate_access_token(1).removeprefix("Bearer ")
+    books = _orm_like_books(catalog, 20)
+    book = books[0]
+
+    return {
+        "hasher.hash_password": measure(
+            lambda: Hasher.hash_password(password), hash_number
+        ),
+        "hasher.verify_password": measure(
+            lambda: Hasher.verify_password(password, hashed), hash_number
+        ),
+        "token.generate_access_token": measure(
+            lambda: TokenManager.generate_access_token(1), number
+        ),
+        "token.decode_access_token": measure(
+            lambda: TokenManager.decode_access_token(token), number
+        ),
+        "token.generate_refresh_token": measure(
+            TokenManager.generate_refresh_token, number
+        ),
+        "book_out_schema.model_dump_json": measure(
+            lambda: BookOutSchema.model_validate(book).model_dump_json(), number
+        ),
+        "serializers.dump_book": measure(lambda: dump_book(book), number),
+        "book_out_schema.page_of_20": measure(
+            lambda: [
+                BookOutSchema.model_validate(item).model_dump_json()
+                for item in books
+            ],
+            number,
+        ),
+        "serializers.dump_page_of_20": measure(
+            lambda: dump_page(books, None), number
+        ),
+    }
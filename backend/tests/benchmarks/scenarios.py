@@ -0,0 +1,218 @@
+import asyncio
+import json
+import random
+import time
+from collections.abc import AsyncIterator, Awaitable, Callable
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Any
+
+import httpx
+from core.db import delete_tables, engine
+from core.migrations import reset_database
+from core.settings import API_URL
+from main import app
+
+from tests.benchmarks.catalog import Catalog
+from tests.benchmarks.stats import summarize
+
+USERNAME = "bench"
+PASSWORD = "bench-password"
+
+Request = Callable[
+    [httpx.AsyncClient, random.Random], Awaitable[httpx.Response]
+]
+
+
+@dataclass
+class LoadContext:
+    """What the scenarios need to know about the seeded database."""
+
+    catalog: Catalog
+    book_ids: list[int]
+    headers: dict[str, str]
+
+
+@asynccontextmanager
+async def app_client(
+    *, reset: bool = False
+) -> AsyncIterator[httpx.AsyncClient]:
+    """Run the application lifespan and yield a client bound to it in-process.
+
+    ``reset`` drops every table first, so results do not depend on what a
+    previous run left behind; Postgres is then migrated afresh. Pooled
+    connections are closed on exit since they belong to the running event
+    loop.
+    """
+    if reset:
+        if engine.dialect.name == "sqlite":
+            await delete_tables()
+        else:
+            await reset_database()
+    try:
+        async with app.router.lifespan_context(app):
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(
+                transport=transport, base_url="http://bench"
+            ) as client:
+                yield client
+    finally:
+        await engine.dispose()
+
+
+async def seed(
+    client: httpx.AsyncClient,
+    catalog: Catalog,
+    chunk_size: int = 1000,
+) -> LoadContext:
+    """Create the benchmark user and upload the catalog through the API."""
+    await client.post(
+        f"{API_URL}/auth/register",
+        json={"username": USERNAME, "password": PASSWORD},
+    )
+    response = await client.post(
+        f"{API_URL}/auth/login",
+        data={"username": USERNAME, "password": PASSWORD},
+    )
+    response.raise_for_status()
+    headers = {"Authorization": response.json()["access_token"]}
+    for chunk in catalog.chunks(chunk_size):
+        response = await client.post(
+            f"{API_URL}/books/bulk-upload",
+            content=json.dumps(chunk),
+            headers=headers,
+        )
+        response.raise_for_status()
+
+    book_ids: list[int] = []
+    cursor = None
+    while True:
+        params: dict[str, Any] = {"limit": 100}
+        if cursor:
+            params["cursor"] = cursor
+        response = await client.get(
+            f"{API_URL}/books/all", params=params, headers=headers
+        )
+        response.raise_for_status()
+        page = response.json()
+        book_ids.extend(book["id"] for book in page["items"])
+        cursor = page["next_cursor"]
+        if not cursor:
+            break
+    return LoadContext(catalog, book_ids, headers)
+
+
+def scenarios(ctx: LoadContext, pages: int = 5) -> dict[str, Request]:
+    """Return the request factory of every load scenario."""
+    terms = ctx.catalog.search_terms()
+
+    async def login(
+        client: httpx.AsyncClient, rng: random.Random
+    ) -> httpx.Response:
+        return await client.post(
+            f"{API_URL}/auth/login",
+            data={"username": USERNAME, "password": PASSWORD},
+        )
+
+    async def books_all_paging(
+        client: httpx.AsyncClient, rng: random.Random
+    ) -> httpx.Response:
+        # One request walks ``pages`` consecutive pages, like a scrolling UI.
+        params: dict[str, Any] = {"limit": 20}
+        for _ in range(pages):
+            response = await client.get(
+                f"{API_URL}/books/all", params=params, headers=ctx.headers
+            )
+            cursor = response.json().get("next_cursor")
+            if response.is_error or not cursor:
+                break
+            params["cursor"] = cursor
+        return response
+
+    async def book_by_id(
+        client: httpx.AsyncClient, rng: random.Random
+    ) -> httpx.Response:
+        return await client.get(
+            f"{API_URL}/books/{rng.choice(ctx.book_ids)}", headers=ctx.headers
+        )
+
+    async def search(
+        client: httpx.AsyncClient, rng: random.Random
+    ) -> httpx.Response:
+        return await client.get(
+            f"{API_URL}/books/search",
+            params={"query": rng.choice(terms)},
+            headers=ctx.headers,
+        )
+
+    async def create(
+        client: httpx.AsyncClient, rng: random.Random
+    ) -> httpx.Response:
+        book = dict(rng.choice(ctx.catalog.rows))
+        book["title"] = f"{book['title']} reprint {rng.randrange(10**9)}"
+        return await client.post(
+            f"{API_URL}/books/", json=book, headers=ctx.headers
+        )
+
+    return {
+        "login": login,
+        "books_all_paging": books_all_paging,
+        "book_by_id": book_by_id,
+        "search": search,
+        "create": create,
+    }
+
+
+async def run_scenario(
+    client: httpx.AsyncClient,
+    request: Request,
+    total: int,
+    concurrency: int,
+    seed: int = 0,
+) -> dict[str, float | int]:
+    """Issue ``total`` requests from ``concurrency`` workers and summarize."""
+    rng = random.Random(seed)
+    latencies: list[float] = []
+    errors = 0
+    remaining = iter(range(total))
+
+    async def worker() -> None:
+        nonlocal errors
+        for _ in remaining:
+            started = time.perf_counter()
+            response = await request(client, rng)
+            latencies.append(time.perf_counter() - started)
+            errors += response.is_error
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return summarize(latencies, time.perf_counter() - started, errors)
+
+
+async def run_load(  # noqa: PLR0913 - mirrors the command line options
+    catalog: Catalog,
+    requests: int,
+    concurrency: int,
+    only: list[str] | None = None,
+    login_requests: int | None = None,
+    *,
+    reset: bool = False,
+) -> dict[str, dict[str, float | int]]:
+    """Seed a database with ``catalog`` and run every load scenario on it.
+
+    Login is bounded by password hashing, so it gets its own, usually
+    smaller, request count.
+    """
+    results: dict[str, dict[str, float | int]] = {}
+    async with app_client(reset=reset) as client:
+        ctx = await seed(client, catalog)
+        for name, request in scenarios(ctx).items():
+            if only and name not in only:
+                continue
+            total = requests
+            if name == "login" and login_requests is not None:
+                total = login_requests
+            results[name] = await run_scenario(
+                client, request, total, concurrency, seed=catalog.seed
+            )
+    return results
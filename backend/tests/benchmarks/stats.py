@@ -0,0 +1,53 @@
+import json
+import math
+import platform
+import statistics
+import time
+from pathlib import Path
+from typing import Any
+
+
+def percentile(sorted_values: list[float], share: float) -> float:
+    """Nearest-rank percentile of already sorted values."""
+    if not sorted_values:
+        return 0.0
+    rank = max(math.ceil(share * len(sorted_values)), 1)
+    return sorted_values[rank - 1]
+
+
+def summarize(
+    latencies: list[float],
+    elapsed: float,
+    errors: int = 0,
+) -> dict[str, float | int]:
+    """Return throughput and latency percentiles, latencies in milliseconds."""
+    values = sorted(latency * 1000 for latency in latencies)
+    return {
+        "requests": len(values),
+        "errors": errors,
+        "seconds": round(elapsed, 4),
+        "throughput": round(len(values) / elapsed, 2) if elapsed else 0.0,
+        "mean_ms": round(statistics.fmean(values), 4) if values else 0.0,
+        "p50_ms": round(percentile(values, 0.50), 4),
+        "p90_ms": round(percentile(values, 0.90), 4),
+        "p99_ms": round(percentile(values, 0.99), 4),
+        "max_ms": round(values[-1], 4) if values else 0.0,
+    }
+
+
+def environment() -> dict[str, str]:
+    """Describe where the numbers were taken, for comparing runs."""
+    return {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+    }
+
+
+def write_results(results: dict[str, Any], path: Path | None) -> str:
+    """Serialize results as JSON, to ``path`` when given."""
+    text = json.dumps(results, indent=2, sort_keys=True)
+    if path is not None:
+        path.write_text(text + "\n")
+    return text
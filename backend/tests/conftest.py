@@ -0,0 +1,12 @@
+import os
+import tempfile
+from pathlib import Path
+
+# Settings are read at import time: point the application at a throwaway
+# SQLite database before any test imports it. Both are forced, since tests
+# reset the database and must never reach one configured in the environment.
+_database = Path(tempfile.mkdtemp(prefix="books-tests-")) / "test.db"
+os.environ["DEBUG"] = "True"
+os.environ["SQLITE_DATABASE_URL"] = f"sqlite+aiosqlite:///{_database}"
+os.environ.setdefault("SECRET_KEY_JWT", "test-secret")
+os.environ.setdefault("ALGORITHM_JWT", "HS256")
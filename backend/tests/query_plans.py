@@ -0,0 +1,116 @@
+import json
+from collections.abc import Collection, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+INDEX_SCANS = frozenset({"Index Scan", "Index Only Scan", "Bitmap Index Scan"})
+
+
+@dataclass
+class QueryPlan:
+    """``EXPLAIN (FORMAT JSON)`` output of one captured statement."""
+
+    statement: str
+    plan: dict[str, Any]
+
+    @property
+    def total_cost(self) -> float:
+        return float(self.plan["Total Cost"])
+
+    def nodes(self) -> Iterator[dict[str, Any]]:
+        """Every plan node, sub-plans and init-plans included."""
+        stack = [self.plan]
+        while stack:
+            node = stack.pop()
+            yield node
+            stack.extend(node.get("Plans", ()))
+
+    @property
+    def seq_scans(self) -> set[str]:
+        """Tables read with a sequential scan."""
+        return {
+            node["Relation Name"]
+            for node in self.nodes()
+            if node["Node Type"] == "Seq Scan"
+        }
+
+    @property
+    def indexes(self) -> set[str]:
+        """Indexes the plan scans."""
+        return {
+            node["Index Name"]
+            for node in self.nodes()
+            if node["Node Type"] in INDEX_SCANS
+        }
+
+    def __str__(self) -> str:
+        """Show the statement with its indented plan in failure messages."""
+        return f"{self.statement}\n{json.dumps(self.plan, indent=2)}"
+
+
+@contextmanager
+def capture_statements(
+    engine: AsyncEngine,
+) -> Iterator[list[tuple[str, Any]]]:
+    """Collect the SQL and parameters of every statement run in the block."""
+    captured: list[tuple[str, Any]] = []
+
+    def _record(
+        *,
+        statement: str,
+        parameters: Any,
+        executemany: bool,
+        **_: Any,
+    ) -> None:
+        if not executemany:
+            captured.append((statement, parameters))
+
+    event.listen(
+        engine.sync_engine, "before_cursor_execute", _record, named=True
+    )
+    try:
+        yield captured
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", _record)
+
+
+async def explain(
+    conn: AsyncConnection,
+    statement: str,
+    parameters: Any,
+) -> QueryPlan:
+    """Plan ``statement`` with its original parameters without running it."""
+    result = await conn.exec_driver_sql(
+        f"EXPLAIN (FORMAT JSON) {statement}", parameters
+    )
+    document = result.scalar_one()
+    if isinstance(document, str):
+        document = json.loads(document)
+    return QueryPlan(statement, document[0]["Plan"])
+
+
+def assert_indexed(
+    plans: list[QueryPlan],
+    max_cost: float,
+    uses: Collection[str] = frozenset(),
+) -> None:
+    """Fail on sequential scans, costly plans or unused indexes.
+
+    Every plan must stay under ``max_cost``, and the plans together must
+    scan each index in ``uses``.
+    """
+    assert plans, "no statements were captured"
+    for plan in plans:
+        assert not plan.seq_scans, (
+            f"sequential scan of {plan.seq_scans}:\n{plan}"
+        )
+        assert plan.total_cost <= max_cost, (
+            f"cost {plan.total_cost} over budget {max_cost}:\n{plan}"
+        )
+    used = set().union(*(plan.indexes for plan in plans))
+    missing = set(uses) - used
+    assert not missing, f"indexes {missing} not used, plans use {used}"
@@ -0,0 +1,52 @@
+import pytest
+
+from tests.benchmarks.catalog import Catalog
+from tests.benchmarks.micro import run_micro
+from tests.benchmarks.scenarios import run_load
+from tests.benchmarks.stats import percentile, summarize
+
+
+def test_catalog_is_reproducible():
+    first = Catalog(books=50, authors=10, seed=7)
+    second = Catalog(books=50, authors=10, seed=7)
+    assert first.rows == second.rows
+    assert first.rows != Catalog(books=50, authors=10, seed=8).rows
+    assert len(first.author_names) == 10
+    assert all(book["authors"] and book["genres"] for book in first.rows)
+
+
+def test_summarize_reports_percentiles():
+    stats = summarize([i / 1000 for i in range(1, 101)], elapsed=2.0, errors=1)
+    assert stats["requests"] == 100
+    assert stats["throughput"] == 50.0
+    assert stats["p50_ms"] == 50.0
+    assert stats["p99_ms"] == 99.0
+    assert stats["errors"] == 1
+    assert percentile([], 0.99) == 0.0
+
+
+def test_micro_benchmarks_run():
+    results = run_micro(number=5, hash_number=1, catalog=Catalog(books=20))
+    assert "serializers.dump_book" in results
+    assert all(stats["requests"] > 0 for stats in results.values())
+
+
+@pytest.mark.asyncio
+async def test_load_scenarios_run_without_errors():
+    results = await run_load(
+        Catalog(books=60, authors=15),
+        requests=8,
+        concurrency=2,
+        login_requests=2,
+        reset=True,
+    )
+    assert set(results) == {
+        "login",
+        "books_all_paging",
+        "book_by_id",
+        "search",
+        "create",
+    }
+    for name, stats in results.items():
+        assert stats["errors"] == 0, name
+        assert stats["requests"] == (2 if name == "login" else 8)
@@ -0,0 +1,33 @@
+import books.repository
+import pytest
+from core.settings import API_URL
+
+from tests.benchmarks.catalog import Catalog
+from tests.benchmarks.scenarios import app_client, seed
+
+
+@pytest.mark.asyncio
+async def test_bitmask_genre_filter_matches_array_mode(
+    monkeypatch: pytest.MonkeyPatch,
+):
+    async with app_client(reset=True) as client:
+        context = await seed(client, Catalog(books=60, authors=10))
+
+        async def filtered(mode: str, query: str) -> list[dict]:
+            monkeypatch.setattr(books.repository, "GENRE_FILTER_MODE", mode)
+            response = await client.get(
+                f"{API_URL}/books/all?limit=100&{query}",
+                headers=context.headers,
+            )
+            assert response.status_code == 200, response.text
+            return response.json()["items"]
+
+        wanted = {"Fantasy", "History"}
+        for match in ("any", "all"):
+            query = f"genres=Fantasy&genres=History&genres_match={match}"
+            found = await filtered("bitmask", query)
+            assert found == await filtered("array", query)
+            for book in found:
+                genres = set(book["genres"])
+                assert wanted <= genres if match == "all" else wanted & genres
+        assert await filtered("bitmask", "genres=Fantasy&genres_match=any")
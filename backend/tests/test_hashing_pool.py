@@ -0,0 +1,39 @@
+import asyncio
+import threading
+
+import pytest
+from auth.exceptions import HashingPoolBusyException
+from auth.services.secure import HashingPool
+
+
+@pytest.mark.asyncio
+async def test_cancelled_callers_keep_their_slot_until_the_hash_ends():
+    pool = HashingPool("thread", workers=2, max_queue=0)
+    started = threading.Semaphore(0)
+    release = threading.Event()
+
+    def slow_hash(password: str) -> str:
+        started.release()
+        release.wait(5)
+        return password
+
+    callers = [
+        asyncio.create_task(pool.run(slow_hash, "secret")) for _ in range(2)
+    ]
+    for _ in callers:
+        await asyncio.to_thread(started.acquire)
+    for caller in callers:
+        caller.cancel()
+    await asyncio.gather(*callers, return_exceptions=True)
+
+    # Both hashes still occupy the workers, so there is no room for more.
+    assert pool.in_flight == 2
+    with pytest.raises(HashingPoolBusyException):
+        await pool.run(slow_hash, "secret")
+
+    release.set()
+    pool.shutdown()
+    while pool.in_flight:
+        await asyncio.sleep(0.01)
+    assert await pool.run(str.upper, "secret") == "SECRET"
+    pool.shutdown()
@@ -0,0 +1,45 @@
+import core.db
+import pytest
+from core.db import QueryBudgetExceededError, QueryStats, track_queries
+from core.settings import API_URL
+
+from tests.benchmarks.catalog import Catalog
+from tests.benchmarks.scenarios import app_client, seed
+
+
+@pytest.fixture
+def strict_budget(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Make a route going over its query budget fail the request."""
+    monkeypatch.setattr(core.db, "DB_QUERY_BUDGET_STRICT", True)
+
+
+def test_strict_budget_raises_when_exceeded(strict_budget):
+    stats = QueryStats("GET /books/1", budget=2)
+    stats.statements = 3
+    with pytest.raises(QueryBudgetExceededError, match="budget is 2"):
+        stats.check_budget()
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("strict_budget")
+async def test_book_routes_stay_within_their_query_budget():
+    async with app_client(reset=True) as client:
+        context = await seed(client, Catalog(books=30, authors=8))
+        book_id = context.book_ids[0]
+        ids = ",".join(map(str, context.book_ids[:5]))
+        # (path, statements allowed by the route's query_budget)
+        routes = [
+            (f"/books/{book_id}", 3),
+            (f"/books/{book_id}", 3),
+            ("/books/all?limit=10", 3),
+            (f"/books/batch?ids={ids}", 3),
+            ("/books/search?query=the", 4),
+            ("/books/suggest?prefix=th", 1),
+        ]
+        for path, budget in routes:
+            with track_queries() as stats:
+                response = await client.get(
+                    f"{API_URL}{path}", headers=context.headers
+                )
+            assert response.status_code == 200, path
+            assert stats.statements <= budget, path
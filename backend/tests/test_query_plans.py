@@ -0,0 +1,218 @@
+"""Query plan regression tests.
+
+Each test runs repository calls against a seeded Postgres schema, captures
+the SQL they issue and checks its ``EXPLAIN (FORMAT JSON)`` plan: no
+sequential scans, the expected indexes and a cost budget. Point
+``TEST_POSTGRES_URL`` at a Postgres database to run them; everything is
+created in a throwaway schema that is dropped afterwards.
+"""
+
+import datetime as dt
+import os
+import uuid
+from collections.abc import AsyncIterator, Awaitable, Callable
+from typing import Any
+
+import pytest
+import pytest_asyncio
+from auth.models import RefreshTokenModel
+from auth.repository import AuthRepository
+from books.repository import AuthorRepository, BookRepository
+from core.migrations import migrate
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    create_async_engine,
+)
+
+from tests.query_plans import (
+    QueryPlan,
+    assert_indexed,
+    capture_statements,
+    explain,
+)
+
+TEST_POSTGRES_URL = os.getenv("TEST_POSTGRES_URL")
+
+pytestmark = [
+    pytest.mark.skipif(
+        not TEST_POSTGRES_URL,
+        reason="TEST_POSTGRES_URL is not set",
+    ),
+    pytest.mark.asyncio(loop_scope="module"),
+]
+
+BOOKS = 50_000
+AUTHORS = 5_000
+USERS = 200_000
+
+# Cost budgets in planner units. A sequential scan of the seeded books
+# table alone costs well over 1000.
+POINT_LOOKUP_COST = 100
+# A page of 20 books, or 20 search hits, and the authors of each.
+PAGE_COST = 250
+# Three authors and their ten books each.
+AUTHOR_BOOKS_COST = 500
+# One sweep batch of 100 expired tokens.
+SWEEP_COST = 1000
+
+SEED = [
+    """
+    INSERT INTO authors (name, created_at)
+    SELECT 'Author ' || g, now() FROM generate_series(1, :authors) g
+    """,
+    """
+    INSERT INTO books (title, published_year, genres, genre_mask, created_at)
+    SELECT 'Book ' || g, 1900 + g % 120, ARRAY['Fiction']::varchar[], 1,
+           now() - g * interval '1 minute'
+    FROM generate_series(1, :books) g
+    """,
+    """
+    INSERT INTO book_authors (book_id, author_id)
+    SELECT g, 1 + g % :authors FROM generate_series(1, :books) g
+    """,
+    """
+    INSERT INTO users (username, password, is_active, created_at)
+    SELECT 'user' || g, 'x', true, now() FROM generate_series(1, :users) g
+    """,
+    # One token per user, every hundredth one already expired.
+    """
+    INSERT INTO refresh_tokens (refresh_token, expires_at, user_id, created_at)
+    SELECT gen_random_uuid(),
+           now() + CASE WHEN g % 100 = 0 THEN -1 ELSE 1 END * interval '1 day',
+           g, now()
+    FROM generate_series(1, :users) g
+    """,
+]
+SEED_SIZES = {"authors": AUTHORS, "books": BOOKS, "users": USERS}
+
+
+@pytest_asyncio.fixture(scope="module", loop_scope="module")
+async def engine() -> AsyncIterator[AsyncEngine]:
+    schema = f"plan_tests_{uuid.uuid4().hex[:8]}"
+    engine = create_async_engine(
+        TEST_POSTGRES_URL,
+        connect_args={"server_settings": {"search_path": f"{schema}, public"}},
+    )
+    async with engine.begin() as conn:
+        await conn.execute(text(f"CREATE SCHEMA {schema}"))
+        await migrate(conn)
+        for statement in SEED:
+            await conn.execute(text(statement), SEED_SIZES)
+    # VACUUM also flushes the GIN pending lists the seed rows went to,
+    # which the planner would otherwise cost as a full scan.
+    async with engine.connect() as conn:
+        await conn.execution_options(isolation_level="AUTOCOMMIT")
+        await conn.execute(text("VACUUM ANALYZE"))
+    try:
+        yield engine
+    finally:
+        async with engine.begin() as conn:
+            await conn.execute(text(f"DROP SCHEMA {schema} CASCADE"))
+        await engine.dispose()
+
+
+@pytest_asyncio.fixture(loop_scope="module")
+async def session(engine: AsyncEngine) -> AsyncIterator[AsyncSession]:
+    """Open a session whose writes are rolled back after the test."""
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        yield session
+        await session.rollback()
+
+
+async def plans_of(
+    engine: AsyncEngine,
+    session: AsyncSession,
+    call: Callable[[], Awaitable[Any]],
+) -> list[QueryPlan]:
+    """Run ``call`` and explain every statement it issued."""
+    with capture_statements(engine) as captured:
+        await call()
+    conn = await session.connection()
+    return [
+        await explain(conn, statement, params)
+        for statement, params in captured
+    ]
+
+
+async def test_get_all_keyset_uses_created_at_index(engine, session):
+    repo = BookRepository(session)
+    created_at = dt.datetime.now(dt.UTC) - dt.timedelta(minutes=BOOKS // 2)
+    plans = await plans_of(
+        engine,
+        session,
+        lambda: repo.get_all(
+            created_at=created_at, last_id=BOOKS // 2, limit=20
+        ),
+    )
+    assert_indexed(plans, PAGE_COST, uses={"ix_books_created_at_id"})
+
+
+async def test_get_page_keyset_uses_created_at_index(engine, session):
+    repo = BookRepository(session)
+    _, cursor = await repo.get_page("created_at", 20)
+    plans = await plans_of(
+        engine, session, lambda: repo.get_page("created_at", 20, cursor)
+    )
+    assert_indexed(plans, PAGE_COST, uses={"ix_books_created_at_id"})
+
+
+async def test_book_point_lookups_use_primary_key(engine, session):
+    repo = BookRepository(session)
+
+    async def lookups() -> None:
+        await repo.get_one(id=BOOKS // 3)
+        await repo.get_by_ids([1, BOOKS // 2, BOOKS])
+
+    plans = await plans_of(engine, session, lookups)
+    assert_indexed(plans, POINT_LOOKUP_COST, uses={"books_pkey"})
+
+
+async def test_author_name_lookups_use_name_index(engine, session):
+    repo = AuthorRepository(session)
+    names = ["Author 10", "Author 2000", "Author 4999"]
+
+    async def lookups() -> None:
+        await repo.get_ids_by_lst(names)
+        await repo.get_ids_by_names(names)
+
+    plans = await plans_of(engine, session, lookups)
+    assert_indexed(
+        plans,
+        AUTHOR_BOOKS_COST,
+        uses={"ix_authors_name", "ix_book_authors_author_id"},
+    )
+
+
+async def test_refresh_token_lookups_use_token_index(engine, session):
+    repo = AuthRepository(session)
+    token = await session.scalar(
+        select(RefreshTokenModel.refresh_token).where(RefreshTokenModel.id == 7)
+    )
+    expires_at = dt.datetime.now(dt.UTC) + dt.timedelta(days=30)
+
+    async def lookups() -> None:
+        await repo.get_one(refresh_token=token)
+        await repo.rotate(token, uuid.uuid4(), expires_at)
+
+    plans = await plans_of(engine, session, lookups)
+    assert_indexed(
+        plans,
+        POINT_LOOKUP_COST,
+        uses={"ix_refresh_tokens_refresh_token", "users_pkey"},
+    )
+
+
+async def test_full_text_search_uses_search_vector_index(engine, session):
+    repo = BookRepository(session)
+    plans = await plans_of(
+        engine, session, lambda: repo.full_text_search("12345", limit=20)
+    )
+    assert_indexed(plans, PAGE_COST, uses={"ix_books_search_vector"})
+
+
+async def test_expired_token_sweep_uses_expiry_index(engine, session):
+    repo = AuthRepository(session)
+    plans = await plans_of(engine, session, lambda: repo.delete_expired(100))
+    assert_indexed(plans, SWEEP_COST, uses={"ix_refresh_tokens_expires_at"})